@@ -10,6 +10,7 @@ from urllib.parse import quote_plus, urlparse
 import re
 import time
 import pickle
+import threading
 from pathlib import Path
 
 from .config import browser_config, DATA_DIR
@@ -89,6 +90,8 @@ class PersistentBrowser:
             "Accept-Language": "en-US,en;q=0.5",
         })
         self.history: List[str] = []
+        # Searches can run on several threads; one cookie-file write at a time
+        self._cookies_lock = threading.Lock()
         self._load_cookies()
     
     def _load_cookies(self):
@@ -103,7 +106,7 @@ class PersistentBrowser:
     def _save_cookies(self):
         """Save cookies to disk"""
         try:
-            with open(self.cookies_path, 'wb') as f:
+            with self._cookies_lock, open(self.cookies_path, 'wb') as f:
                 pickle.dump(self.session.cookies, f)
         except Exception:
             pass
@@ -344,12 +347,15 @@ class WebBrowser:
 
 # Convenience functions
 _browser: Optional[WebBrowser] = None
+_browser_lock = threading.Lock()
 
 def get_browser() -> WebBrowser:
     """Get or create browser instance (with persistent cookies)"""
     global _browser
     if _browser is None:
-        _browser = WebBrowser(persistent=True)
+        with _browser_lock:
+            if _browser is None:
+                _browser = WebBrowser(persistent=True)
     return _browser
 
 
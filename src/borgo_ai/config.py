@@ -3,24 +3,37 @@ Configuration settings for borgo-ai
 Optimized for 16GB RAM + RTX 3060 Ti
 """
 import os
+import sys
 from pathlib import Path
 from dataclasses import dataclass, field
-from typing import Optional
+from typing import Optional, Dict, Tuple
 import json
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Base directories
 BASE_DIR = Path(__file__).parent
 DATA_DIR = BASE_DIR / "data"
 USERS_DIR = DATA_DIR / "users"
 KNOWLEDGE_DIR = DATA_DIR / "knowledge"
+CHUNK_CACHE_DIR = DATA_DIR / "chunk_cache"
+# Answer cache for one-shot commands, one per user under USERS_DIR/<username>
+RESPONSE_CACHE_FILE = "response_cache.sqlite3"
 
 # Ensure directories exist
 DATA_DIR.mkdir(exist_ok=True)
 USERS_DIR.mkdir(exist_ok=True)
 KNOWLEDGE_DIR.mkdir(exist_ok=True)
+CHUNK_CACHE_DIR.mkdir(exist_ok=True)
+
+# Slotted dataclasses (no per-instance __dict__) need Python 3.10+
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class LLMConfig:
     """
     LLM Configuration - optimized for RTX 3060 Ti (8GB VRAM)
@@ -44,9 +57,10 @@ class LLMConfig:
     context_window: int = 8192
     top_p: float = 0.9
     repeat_penalty: float = 1.05  # Lower to avoid repetitive refusals
+    keep_alive: str = "30m"  # Keep the model (and its prompt cache) loaded between calls
 
 
-@dataclass
+@dataclass(frozen=True, **_SLOTS)
 class EmbeddingConfig:
     """Embedding Configuration"""
     model: str = "nomic-embed-text"  # Lightweight, runs well on 3060 Ti
@@ -55,7 +69,7 @@ class EmbeddingConfig:
     chunk_overlap: int = 50
 
 
-@dataclass
+@dataclass(frozen=True, **_SLOTS)
 class MemoryConfig:
     """Memory system configuration"""
     max_short_term_messages: int = 20  # Recent conversation context
@@ -64,7 +78,7 @@ class MemoryConfig:
     auto_summarize_after: int = 10  # Auto-summarize after N messages
 
 
-@dataclass 
+@dataclass(frozen=True, **_SLOTS)
 class BrowserConfig:
     """Browser/Search configuration"""
     max_search_results: int = 5
@@ -73,7 +87,7 @@ class BrowserConfig:
     user_agent: str = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
 
 
-@dataclass
+@dataclass(frozen=True, **_SLOTS)
 class AgentConfig:
     """Agentic mode configuration"""
     max_iterations: int = 10
@@ -87,7 +101,34 @@ class AgentConfig:
     ])
 
 
-@dataclass
+# Parsed settings per user, keyed by the (mtime_ns, size) of the file they came from
+_settings_cache: Dict[str, Tuple[Tuple[int, int], dict]] = {}
+
+
+def _dump_json(data: dict) -> bytes:
+    """Serialize settings as indented JSON, using orjson when it's installed"""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, indent=2).encode()
+
+
+def _load_json(raw: bytes) -> dict:
+    """Parse settings JSON, using orjson when it's installed"""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def _file_signature(path) -> Optional[Tuple[int, int]]:
+    """Return (mtime_ns, size) for a file, or None if it doesn't exist"""
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+@dataclass(**_SLOTS)
 class UserSettings:
     """Per-user settings"""
     username: str = "default"
@@ -119,16 +160,41 @@ class UserSettings:
         user_dir = USERS_DIR / self.username
         user_dir.mkdir(exist_ok=True)
         settings_file = user_dir / "settings.json"
-        with open(settings_file, "w") as f:
-            json.dump(self.to_dict(), f, indent=2)
+        data = self.to_dict()
+        
+        # Skip the write if the file on disk already holds exactly these settings
+        cached = _settings_cache.get(self.username)
+        if cached and cached[1] == data and cached[0] == _file_signature(settings_file):
+            return
+        
+        # Write to a temp file and swap it in so readers never see a torn file
+        tmp_file = settings_file.with_suffix(".json.tmp")
+        with open(tmp_file, "wb") as f:
+            f.write(_dump_json(data))
+        os.replace(tmp_file, settings_file)
+        _settings_cache[self.username] = (_file_signature(settings_file), data)
     
     @classmethod
     def load(cls, username: str) -> "UserSettings":
-        settings_file = USERS_DIR / username / "settings.json"
-        if settings_file.exists():
-            with open(settings_file) as f:
-                return cls.from_dict(json.load(f))
-        return cls(username=username)
+        settings_file = os.path.join(USERS_DIR, username, "settings.json")
+        # One stat decides between "missing", "unchanged since last read" and "reload"
+        signature = _file_signature(settings_file)
+        if signature is None:
+            return cls(username=username)
+        
+        cached = _settings_cache.get(username)
+        if cached and cached[0] == signature:
+            return cls.from_dict(cached[1])
+        
+        try:
+            with open(settings_file, "rb") as f:
+                # Sign what was actually read, in case the file changed since the stat
+                st = os.fstat(f.fileno())
+                data = _load_json(f.read())
+        except FileNotFoundError:
+            return cls(username=username)
+        _settings_cache[username] = ((st.st_mtime_ns, st.st_size), data)
+        return cls.from_dict(data)
 
 
 # Global config instances
@@ -3,10 +3,12 @@ Embeddings Module - Vector embeddings using Ollama
 Optimized for RTX 3060 Ti
 """
 import requests
+from requests.adapters import HTTPAdapter
 import json
 import numpy as np
 from typing import List, Optional
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 import pickle
 
 from .config import embedding_config, llm_config
@@ -15,16 +17,27 @@ from .config import embedding_config, llm_config
 class OllamaEmbeddings:
     """Generate embeddings using Ollama's embedding models"""
     
+    # Requests embed_batch keeps in flight at once
+    MAX_PARALLEL_REQUESTS = 4
+    
     def __init__(self, config=None):
         self.config = config or embedding_config
         self.base_url = llm_config.base_url
         self.model = self.config.model
         self.dimension = self.config.dimension
+        # Keep-alive connections shared by every embedding request
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=self.MAX_PARALLEL_REQUESTS,
+            pool_maxsize=self.MAX_PARALLEL_REQUESTS
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
     
     def embed_text(self, text: str) -> np.ndarray:
         """Generate embedding for a single text"""
         try:
-            response = requests.post(
+            response = self.session.post(
                 f"{self.base_url}/api/embeddings",
                 json={
                     "model": self.model,
@@ -42,10 +55,15 @@ class OllamaEmbeddings:
     
     def embed_batch(self, texts: List[str]) -> np.ndarray:
         """Generate embeddings for multiple texts"""
-        embeddings = []
-        for text in texts:
-            emb = self.embed_text(text)
-            embeddings.append(emb)
+        # /api/embed would take the whole list in one call, but it returns
+        # normalized vectors that aren't comparable with the /api/embeddings ones
+        # already stored in existing indexes; overlap the requests instead
+        if len(texts) < 2:
+            embeddings = [self.embed_text(text) for text in texts]
+        else:
+            workers = min(self.MAX_PARALLEL_REQUESTS, len(texts))
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                embeddings = list(pool.map(self.embed_text, texts))
         return np.vstack(embeddings)
     
     def check_model_available(self) -> bool:
@@ -5,15 +5,43 @@ Supports: Python (sandboxed), Bash (with user approval)
 import subprocess
 import sys
 import os
-import tempfile
 import threading
-import queue
+import multiprocessing
+import selectors
+import shlex
+import shutil
+import signal
+import time
+import uuid
+from io import StringIO
 from typing import Optional, Tuple, Dict, Any
 from dataclasses import dataclass
+from collections import OrderedDict
+from types import CodeType, MappingProxyType
 from enum import Enum
 import re
 import ast
 
+# Modules preloaded into every sandbox run
+import math
+import datetime
+import json
+import random
+import collections
+import itertools
+import functools
+
+_SANDBOX_MODULES = MappingProxyType({
+    'math': math,
+    'datetime': datetime,
+    'json': json,
+    're': re,
+    'random': random,
+    'collections': collections,
+    'itertools': itertools,
+    'functools': functools,
+})
+
 
 class ExecutionMode(Enum):
     """Code execution safety modes"""
@@ -22,6 +50,51 @@ class ExecutionMode(Enum):
     BLOCKED = "blocked"     # Never execute
 
 
+class _LRUCache:
+    """Small bounded mapping that evicts the least recently used entry"""
+    
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._data: "OrderedDict[Any, Any]" = OrderedDict()
+    
+    def get(self, key, default=None):
+        try:
+            self._data.move_to_end(key)
+        except KeyError:
+            return default
+        return self._data[key]
+    
+    def put(self, key, value):
+        self._data[key] = value
+        self._data.move_to_end(key)
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+
+class _UnsafeCode(Exception):
+    """Raised by _SafetyVisitor to stop the walk at the first violation"""
+
+
+class _SafetyVisitor(ast.NodeVisitor):
+    """Single AST pass that rejects imports outside the allowed modules"""
+    
+    def __init__(self, allowed_modules: set):
+        self.allowed_modules = allowed_modules
+    
+    def _check_import(self, full_name: str):
+        base_module = full_name.split('.')[0]
+        if base_module not in self.allowed_modules:
+            raise _UnsafeCode(f"Blocked: Import of '{base_module}' not allowed")
+    
+    def visit_Import(self, node: ast.Import):
+        for alias in node.names:
+            self._check_import(alias.name)
+    
+    def visit_ImportFrom(self, node: ast.ImportFrom):
+        for alias in node.names:
+            self._check_import(f"{node.module}.{alias.name}" if node.module else alias.name)
+
+
 @dataclass
 class ExecutionResult:
     """Result of code execution"""
@@ -138,64 +211,120 @@ class PythonSandbox:
         'typing',
     }
     
-    DANGEROUS_PATTERNS = [
-        r'\bimport\s+os\b',
-        r'\bimport\s+sys\b',
-        r'\bimport\s+subprocess\b',
-        r'\bimport\s+shutil\b',
-        r'\bimport\s+pathlib\b',
-        r'\bimport\s+socket\b',
-        r'\bimport\s+requests\b',
-        r'\bimport\s+urllib\b',
-        r'\bimport\s+http\b',
-        r'\bfrom\s+os\b',
-        r'\bfrom\s+sys\b',
-        r'\b__import__\b',
-        r'\bexec\s*\(',
-        r'\beval\s*\(',
-        r'\bcompile\s*\(',
-        r'\bopen\s*\(',
-        r'\bos\.',
-        r'\bsys\.',
-        r'\bsubprocess\.',
-        r'\.system\s*\(',
-        r'\.popen\s*\(',
+    # Dangerous patterns grouped by a literal that every match contains
+    # (case-insensitively), so a plain substring test can rule a group out
+    # before its regex ever runs
+    DANGEROUS_PATTERN_GROUPS = {
+        'import': [
+            r'\bimport\s+os\b',
+            r'\bimport\s+sys\b',
+            r'\bimport\s+subprocess\b',
+            r'\bimport\s+shutil\b',
+            r'\bimport\s+pathlib\b',
+            r'\bimport\s+socket\b',
+            r'\bimport\s+requests\b',
+            r'\bimport\s+urllib\b',
+            r'\bimport\s+http\b',
+            r'\b__import__\b',
+        ],
+        'from': [r'\bfrom\s+os\b', r'\bfrom\s+sys\b'],
+        'exec': [r'\bexec\s*\('],
+        'eval': [r'\beval\s*\('],
+        'compile': [r'\bcompile\s*\('],
+        'open': [r'\bopen\s*\(', r'\.popen\s*\('],
+        'os.': [r'\bos\.'],
+        'sys.': [r'\bsys\.'],
+        'subprocess.': [r'\bsubprocess\.'],
+        '.system': [r'\.system\s*\('],
+    }
+    
+    DANGEROUS_PATTERNS = [p for group in DANGEROUS_PATTERN_GROUPS.values() for p in group]
+    
+    # All patterns fused into one alternation so the input is scanned once;
+    # each pattern gets its own group so `lastindex` reports which one hit
+    _DANGEROUS_RE = re.compile(
+        "|".join(f"({p})" for p in DANGEROUS_PATTERNS), re.IGNORECASE
+    )
+    
+    # The same fusion per literal group, as (literal, regex, patterns)
+    _DANGEROUS_GROUP_RES = [
+        (literal, re.compile("|".join(f"({p})" for p in group), re.IGNORECASE), group)
+        for literal, group in DANGEROUS_PATTERN_GROUPS.items()
     ]
     
-    def __init__(self, timeout: float = 10.0):
+    SAFETY_CACHE_SIZE = 256
+    CODE_CACHE_SIZE = 128
+    # Spare capture buffers kept between runs, and the largest output worth keeping one for
+    BUFFER_POOL_SIZE = 4
+    BUFFER_POOL_MAX_CHARS = 64 * 1024
+    # Extra address space the worker may allocate on top of what it starts with
+    WORKER_MEMORY_LIMIT = 512 * 1024 * 1024
+    
+    def __init__(self, timeout: float = 10.0, isolated: bool = True):
         self.timeout = timeout
+        # Run code in a separate worker process (started on first use) so it
+        # can be memory-capped, interrupted on timeout and killed if it hangs
+        self.isolated = isolated
+        self._worker = None
+        self._conn = None
+        self._worker_lock = threading.Lock()
+        # Verdicts keyed by the source itself: agent loops re-run identical
+        # snippets, and a content-addressed result never goes stale
+        self._safety_cache = _LRUCache(self.SAFETY_CACHE_SIZE)
+        self._code_cache = _LRUCache(self.CODE_CACHE_SIZE)
+        self._buffer_pool = []
+        self._safe_globals = self._build_globals()
+    
+    def _build_globals(self) -> Dict[str, Any]:
+        """Build the globals template shared by every run"""
+        return {'__builtins__': self.SAFE_BUILTINS, **_SANDBOX_MODULES}
     
     def is_safe(self, code: str) -> Tuple[bool, Optional[str]]:
         """Check if code is safe to execute"""
-        # Check for dangerous patterns
-        for pattern in self.DANGEROUS_PATTERNS:
-            if re.search(pattern, code, re.IGNORECASE):
+        verdict = self._safety_cache.get(code)
+        if verdict is None:
+            verdict = self._check_safety(code)
+            self._safety_cache.put(code, verdict)
+        return verdict
+    
+    def _check_safety(self, code: str) -> Tuple[bool, Optional[str]]:
+        """Run the pattern and AST checks (uncached)"""
+        # Check for dangerous patterns. Non-ASCII code always gets the full scan:
+        # IGNORECASE folds characters like 'ſ' to 's', which lower() does not
+        if code.isascii():
+            lowered = code.lower()
+            for literal, regex, patterns in self._DANGEROUS_GROUP_RES:
+                if literal in lowered:
+                    match = regex.search(code)
+                    if match:
+                        pattern = patterns[match.lastindex - 1]
+                        return False, f"Blocked: Dangerous pattern detected ({pattern})"
+        else:
+            match = self._DANGEROUS_RE.search(code)
+            if match:
+                pattern = self.DANGEROUS_PATTERNS[match.lastindex - 1]
                 return False, f"Blocked: Dangerous pattern detected ({pattern})"
         
-        # Try to parse the AST to check for dangerous constructs
+        # Parse the AST and check for dangerous imports, stopping at the first one
         try:
-            tree = ast.parse(code)
-            for node in ast.walk(tree):
-                # Check for dangerous imports
-                if isinstance(node, (ast.Import, ast.ImportFrom)):
-                    module = node.module if isinstance(node, ast.ImportFrom) else None
-                    names = [alias.name for alias in node.names]
-                    
-                    for name in names:
-                        full_name = f"{module}.{name}" if module else name
-                        base_module = full_name.split('.')[0]
-                        
-                        if base_module not in self.SAFE_MODULES:
-                            return False, f"Blocked: Import of '{base_module}' not allowed"
+            _SafetyVisitor(self.SAFE_MODULES).visit(ast.parse(code))
+        except _UnsafeCode as e:
+            return False, str(e)
         except SyntaxError as e:
             return False, f"Syntax error: {e}"
         
         return True, None
     
+    def _compile(self, code: str) -> CodeType:
+        """Compile code once and reuse the code object on later runs"""
+        code_obj = self._code_cache.get(code)
+        if code_obj is None:
+            code_obj = compile(code, "<sandbox>", "exec")
+            self._code_cache.put(code, code_obj)
+        return code_obj
+    
     def execute(self, code: str) -> ExecutionResult:
         """Execute Python code safely"""
-        import time
-        
         # Safety check
         is_safe, error = self.is_safe(code)
         if not is_safe:
@@ -208,34 +337,88 @@ class PythonSandbox:
                 error=error
             )
         
-        # Create safe globals
-        import math
-        import datetime
-        import json as json_module
-        import re as re_module
-        import random
-        import collections
-        import itertools
-        import functools
-        
-        safe_globals = {
-            '__builtins__': self.SAFE_BUILTINS,
-            'math': math,
-            'datetime': datetime,
-            'json': json_module,
-            're': re_module,
-            'random': random,
-            'collections': collections,
-            'itertools': itertools,
-            'functools': functools,
-        }
+        if self.isolated:
+            result = self._execute_in_worker(code)
+            if result is not None:
+                return result
         
-        # Capture output
-        from io import StringIO
-        import contextlib
+        return self._run(code)
+    
+    def _get_worker(self):
+        """Get the connection to the worker process, starting it if needed"""
+        if self._worker is not None and self._worker.is_alive():
+            return self._conn
         
-        stdout_capture = StringIO()
-        stderr_capture = StringIO()
+        self.close()
+        try:
+            # spawn (not fork): the child starts clean instead of inheriting
+            # the app's threads, loaded models and open sockets
+            ctx = multiprocessing.get_context("spawn")
+            parent_conn, child_conn = ctx.Pipe()
+            worker = ctx.Process(
+                target=_sandbox_worker,
+                args=(child_conn, self.timeout, self.WORKER_MEMORY_LIMIT),
+                daemon=True
+            )
+            worker.start()
+            child_conn.close()
+        except Exception:
+            # Can't spawn processes here: run in-process from now on
+            self.isolated = False
+            return None
+        
+        self._worker, self._conn = worker, parent_conn
+        return self._conn
+    
+    def _execute_in_worker(self, code: str) -> Optional[ExecutionResult]:
+        """Run code in the worker process (None if no worker is available)"""
+        with self._worker_lock:
+            conn = self._get_worker()
+            if conn is None:
+                return None
+            
+            start_time = time.time()
+            try:
+                conn.send(code)
+                # The worker interrupts runaway code itself; this is the backstop
+                # for code stuck where the interrupt can't reach it
+                if conn.poll(self.timeout + 1):
+                    return conn.recv()
+                error = f"Execution timed out after {self.timeout}s"
+            except (EOFError, OSError):
+                error = "Sandbox worker crashed (memory limit exceeded?)"
+            
+            # Hung or dead: kill it, a fresh worker is started on the next call
+            self.close()
+            return ExecutionResult(
+                success=False,
+                stdout="",
+                stderr=error,
+                return_value=None,
+                execution_time=time.time() - start_time,
+                error=error
+            )
+    
+    def close(self):
+        """Stop the worker process"""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+        if self._worker is not None:
+            if self._worker.is_alive():
+                self._worker.kill()
+            self._worker.join()
+            self._worker = None
+    
+    def _run(self, code: str, interruptible: bool = False) -> ExecutionResult:
+        """Execute already-checked code in this process"""
+        # Fresh copies so one run can't leak names or patched builtins into the next
+        safe_globals = self._safe_globals.copy()
+        safe_globals['__builtins__'] = self.SAFE_BUILTINS.copy()
+        
+        # Capture output
+        stdout_capture = self._get_buffer()
+        stderr_capture = self._get_buffer()
         
         result_value = None
         success = True
@@ -243,33 +426,111 @@ class PythonSandbox:
         
         start_time = time.time()
         
+        # Interrupt runaway code with SIGALRM (worker only: it owns its main thread)
+        use_alarm = interruptible and hasattr(signal, "setitimer")
+        if use_alarm:
+            old_handler = signal.signal(signal.SIGALRM, _raise_timeout)
+            signal.setitimer(signal.ITIMER_REAL, self.timeout)
+        
+        # Swap the streams directly rather than via contextlib.redirect_*
+        old_stdout, old_stderr = sys.stdout, sys.stderr
+        sys.stdout, sys.stderr = stdout_capture, stderr_capture
+        
         try:
-            with contextlib.redirect_stdout(stdout_capture), \
-                 contextlib.redirect_stderr(stderr_capture):
-                
-                # Execute with timeout
-                exec_result = {}
-                exec(code, safe_globals, exec_result)
-                
-                # Try to get a result (last expression)
-                if '_result' in exec_result:
-                    result_value = exec_result['_result']
+            # Execute with timeout
+            exec_result = {}
+            exec(self._compile(code), safe_globals, exec_result)
+            
+            # Try to get a result (last expression)
+            if '_result' in exec_result:
+                result_value = exec_result['_result']
         
         except Exception as e:
             success = False
             error_msg = f"{type(e).__name__}: {e}"
             stderr_capture.write(error_msg)
         
+        finally:
+            sys.stdout, sys.stderr = old_stdout, old_stderr
+            if use_alarm:
+                signal.setitimer(signal.ITIMER_REAL, 0)
+                signal.signal(signal.SIGALRM, old_handler)
+        
         execution_time = time.time() - start_time
+        stdout = self._release_buffer(stdout_capture)
+        stderr = self._release_buffer(stderr_capture)
         
         return ExecutionResult(
             success=success,
-            stdout=stdout_capture.getvalue(),
-            stderr=stderr_capture.getvalue(),
+            stdout=stdout,
+            stderr=stderr,
             return_value=result_value,
             execution_time=execution_time,
             error=error_msg
         )
+    
+    def _get_buffer(self) -> StringIO:
+        """Take a capture buffer from the pool, or make a new one"""
+        try:
+            return self._buffer_pool.pop()
+        except IndexError:
+            return StringIO()
+    
+    def _release_buffer(self, buffer: StringIO) -> str:
+        """Return a buffer's contents and hand it back to the pool"""
+        value = buffer.getvalue()
+        if len(value) <= self.BUFFER_POOL_MAX_CHARS and len(self._buffer_pool) < self.BUFFER_POOL_SIZE:
+            buffer.seek(0)
+            buffer.truncate(0)
+            self._buffer_pool.append(buffer)
+        return value
+
+
+def _raise_timeout(signum, frame):
+    raise TimeoutError("Execution timed out")
+
+
+def _limit_memory(extra_bytes: int):
+    """Cap this process's address space at its current size plus extra_bytes"""
+    try:
+        import resource
+    except ImportError:
+        return  # Not available on Windows
+    
+    try:
+        with open("/proc/self/statm") as f:
+            current = int(f.read().split()[0]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        current = 0
+    
+    _, hard = resource.getrlimit(resource.RLIMIT_AS)
+    limit = current + extra_bytes
+    if hard != resource.RLIM_INFINITY:
+        limit = min(limit, hard)
+    try:
+        resource.setrlimit(resource.RLIMIT_AS, (limit, hard))
+    except (ValueError, OSError):
+        pass
+
+
+def _sandbox_worker(conn, timeout: float, memory_limit: int):
+    """Worker process loop: run each snippet received on conn, send back the result"""
+    _limit_memory(memory_limit)
+    sandbox = PythonSandbox(timeout=timeout, isolated=False)
+    
+    while True:
+        try:
+            code = conn.recv()
+        except (EOFError, OSError):
+            break
+        
+        result = sandbox._run(code, interruptible=True)
+        try:
+            conn.send(result)
+        except Exception:
+            # Return value can't be pickled back to the parent: send its repr
+            result.return_value = repr(result.return_value)
+            conn.send(result)
 
 
 class BashExecutor:
@@ -309,35 +570,60 @@ class BashExecutor:
         r'\bchmod\s+-R\s+777\s+/',
     ]
     
+    _BLOCKED_RE = re.compile("|".join(f"(?:{p})" for p in BLOCKED_PATTERNS), re.IGNORECASE)
+    
     # Only allow GET for curl/wget
     NETWORK_RESTRICTIONS = {
         'curl': ['-X POST', '-X PUT', '-X DELETE', '-X PATCH', '--data', '-d ', '--upload-file', '-T '],
         'wget': ['--post-data', '--post-file', '--method=POST'],
     }
     
+    # POSIX guarantees pipe writes up to this size never block half-way
+    _WRITE_CHUNK = 512
+    
+    # Literal matchers compiled with the class: a single alternation scans the
+    # lowercased command in one pass no matter how many entries there are
+    _BLOCKED_COMMANDS_RE = re.compile(
+        "|".join(re.escape(c.lower()) for c in BLOCKED_COMMANDS)
+    )
+    _NETWORK_TOOLS_RE = re.compile(
+        "|".join(re.escape(tool) for tool in NETWORK_RESTRICTIONS)
+    )
+    _NETWORK_ARGS_RE = {
+        tool: re.compile("|".join(f"({re.escape(arg.lower())})" for arg in args))
+        for tool, args in NETWORK_RESTRICTIONS.items()
+    }
+    
     def __init__(self, timeout: float = 30.0):
         self.timeout = timeout
+        
+        # Long-lived bash that runs every approved command (started lazily)
+        self._shell: Optional[subprocess.Popen] = None
+        self._stdin_fd: Optional[int] = None
+        self._shell_lock = threading.Lock()
     
     def is_safe(self, command: str) -> Tuple[bool, Optional[str]]:
         """Check if command is safe to run (after user approval)"""
         command_lower = command.lower()
         
         # Check blocked commands
-        for blocked in self.BLOCKED_COMMANDS:
-            if blocked.lower() in command_lower:
-                return False, f"Blocked: Dangerous command pattern"
+        if self._BLOCKED_COMMANDS_RE.search(command_lower):
+            return False, f"Blocked: Dangerous command pattern"
         
         # Check blocked patterns
-        for pattern in self.BLOCKED_PATTERNS:
-            if re.search(pattern, command, re.IGNORECASE):
-                return False, f"Blocked: Dangerous command pattern"
+        if self._BLOCKED_RE.search(command):
+            return False, f"Blocked: Dangerous command pattern"
         
-        # Check network restrictions (no POST/PUT/DELETE)
-        for tool, blocked_args in self.NETWORK_RESTRICTIONS.items():
-            if tool in command_lower:
-                for arg in blocked_args:
-                    if arg.lower() in command_lower:
-                        return False, f"Blocked: Only GET requests allowed ({arg} not permitted)"
+        # Check network restrictions (no POST/PUT/DELETE), only for the
+        # tools that actually appear in the command
+        tools_present = set(self._NETWORK_TOOLS_RE.findall(command_lower))
+        for tool in self.NETWORK_RESTRICTIONS:
+            if tool not in tools_present:
+                continue
+            match = self._NETWORK_ARGS_RE[tool].search(command_lower)
+            if match:
+                arg = self.NETWORK_RESTRICTIONS[tool][match.lastindex - 1]
+                return False, f"Blocked: Only GET requests allowed ({arg} not permitted)"
         
         return True, None
     
@@ -353,8 +639,6 @@ class BashExecutor:
         cwd: Optional[str] = None
     ) -> ExecutionResult:
         """Execute bash command (only if approved)"""
-        import time
-        
         # Safety check
         is_safe, error = self.is_safe(command)
         if not is_safe:
@@ -381,22 +665,15 @@ class BashExecutor:
         start_time = time.time()
         
         try:
-            result = subprocess.run(
-                command,
-                shell=True,
-                capture_output=True,
-                text=True,
-                timeout=self.timeout,
-                cwd=cwd
-            )
+            returncode, stdout, stderr = self._run(command, cwd)
             
             execution_time = time.time() - start_time
             
             return ExecutionResult(
-                success=result.returncode == 0,
-                stdout=result.stdout,
-                stderr=result.stderr,
-                return_value=result.returncode,
+                success=returncode == 0,
+                stdout=stdout,
+                stderr=stderr,
+                return_value=returncode,
                 execution_time=execution_time
             )
         
@@ -420,9 +697,175 @@ class BashExecutor:
             )
 
 
+    def _run(self, command: str, cwd: Optional[str]) -> Tuple[int, str, str]:
+        """Run a command, returning (returncode, stdout, stderr)"""
+        with self._shell_lock:
+            shell = self._get_shell()
+            if shell is None:
+                # No bash/POSIX pipes available: one shell per command
+                result = subprocess.run(
+                    command,
+                    shell=True,
+                    capture_output=True,
+                    text=True,
+                    timeout=self.timeout,
+                    cwd=cwd
+                )
+                return result.returncode, result.stdout, result.stderr
+            
+            try:
+                result = self._run_in_shell(shell, command, cwd)
+            except BaseException:
+                # Timed out mid-command: its state is unknown, start over next time
+                self.close()
+                raise
+            if shell.poll() is not None:
+                self.close()
+            return result
+    
+    def _get_shell(self) -> Optional[subprocess.Popen]:
+        """Get the persistent bash process, starting it if needed"""
+        if self._shell is not None and self._shell.poll() is None:
+            return self._shell
+        
+        self.close()
+        bash = shutil.which("bash")
+        if os.name != "posix" or bash is None:
+            return None
+        
+        # Commands read our own stdin, as they did under subprocess.run; the
+        # shell's stdin is the command pipe, so hand it a copy on a spare fd
+        try:
+            self._stdin_fd = os.dup(sys.stdin.fileno())
+        except (AttributeError, ValueError, OSError):
+            self._stdin_fd = None
+        
+        # Same session and process group as us, so the terminal stays the
+        # controlling TTY and sudo & co. can still prompt on it
+        self._shell = subprocess.Popen(
+            [bash, "--noprofile", "--norc"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            pass_fds=() if self._stdin_fd is None else (self._stdin_fd,)
+        )
+        return self._shell
+    
+    def _run_in_shell(
+        self,
+        shell: subprocess.Popen,
+        command: str,
+        cwd: Optional[str]
+    ) -> Tuple[int, str, str]:
+        """Send one command to the persistent shell and collect its output"""
+        # Each command runs in a subshell so `cd`, `exit` and variables don't
+        # leak into the next one, with stdin redirected so it can't eat our input.
+        # It is passed quoted to `eval`, so a syntax error or unbalanced quote
+        # fails that command with status 2 instead of breaking the shell's framing.
+        # A random sentinel (plus the exit code on stdout) marks the end of output.
+        sentinel = uuid.uuid4().hex
+        cd = f"cd -- {shlex.quote(cwd)} || exit 1\n" if cwd else ""
+        stdin = "/dev/null" if self._stdin_fd is None else f"&{self._stdin_fd}"
+        script = (
+            f"(\n{cd}eval -- {shlex.quote(command)}\n) <{stdin}\n"
+            f"printf '\\n{sentinel} %d\\n' $?\n"
+            f"printf '\\n{sentinel}\\n' >&2\n"
+        ).encode()
+        script = memoryview(script)
+        
+        stdin_fd = shell.stdin.fileno()
+        stdout_fd = shell.stdout.fileno()
+        stderr_fd = shell.stderr.fileno()
+        markers = {
+            stdout_fd: f"\n{sentinel} ".encode(),
+            stderr_fd: f"\n{sentinel}\n".encode(),
+        }
+        buffers = {stdout_fd: bytearray(), stderr_fd: bytearray()}
+        ends = {}  # fd -> index where the sentinel starts
+        closed = set()  # fds that hit EOF first: the shell itself died
+        deadline = time.monotonic() + self.timeout
+        
+        with selectors.DefaultSelector() as selector:
+            selector.register(stdin_fd, selectors.EVENT_WRITE)
+            selector.register(stdout_fd, selectors.EVENT_READ)
+            selector.register(stderr_fd, selectors.EVENT_READ)
+            
+            while len(ends) + len(closed) < 2:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise subprocess.TimeoutExpired(command, self.timeout)
+                
+                for key, _ in selector.select(remaining):
+                    fd = key.fd
+                    if fd == stdin_fd:
+                        try:
+                            written = os.write(fd, script[:self._WRITE_CHUNK])
+                        except BrokenPipeError:
+                            written = len(script)  # Dead shell: its output pipes report why
+                        script = script[written:]
+                        if not script:
+                            selector.unregister(fd)
+                        continue
+                    
+                    chunk = os.read(fd, 65536)
+                    if not chunk:
+                        closed.add(fd)
+                        selector.unregister(fd)
+                        continue
+                    
+                    buf = buffers[fd]
+                    search_from = max(0, len(buf) - len(markers[fd]))
+                    buf.extend(chunk)
+                    if fd not in ends:
+                        idx = buf.find(markers[fd], search_from)
+                        # stdout's marker is followed by the exit code and a newline
+                        if idx != -1 and (fd == stderr_fd or buf.find(b"\n", idx + 1) != -1):
+                            ends[fd] = idx
+                    if fd in ends:
+                        selector.unregister(fd)
+        
+        if closed:
+            # Report whatever the shell managed to say before it went away
+            stderr = buffers[stderr_fd][:ends.get(stderr_fd)].decode(errors="replace")
+            return (
+                shell.wait(),
+                buffers[stdout_fd][:ends.get(stdout_fd)].decode(errors="replace"),
+                stderr or "Shell exited unexpectedly",
+            )
+        
+        out = buffers[stdout_fd]
+        returncode = int(out[ends[stdout_fd] + len(markers[stdout_fd]):].split()[0])
+        return (
+            returncode,
+            out[:ends[stdout_fd]].decode(errors="replace"),
+            buffers[stderr_fd][:ends[stderr_fd]].decode(errors="replace"),
+        )
+    
+    def close(self):
+        """Stop the persistent shell"""
+        if self._stdin_fd is not None:
+            os.close(self._stdin_fd)
+            self._stdin_fd = None
+        if self._shell is None:
+            return
+        self._shell.kill()
+        self._shell.wait()
+        for stream in (self._shell.stdin, self._shell.stdout, self._shell.stderr):
+            stream.close()
+        self._shell = None
+
+
 class CodeExecutor:
     """Unified code execution interface"""
     
+    PYTHON_INDICATORS = ['def ', 'import ', 'from ', 'class ', 'print(', 'if __name__']
+    BASH_INDICATORS = ['echo ', 'ls ', 'cd ', 'mkdir ', 'grep ', 'cat ', 'wget ', 'curl ']
+    
+    # One group per indicator, so a single scan tells which ones are present
+    _INDICATOR_RE = re.compile(
+        "|".join(f"({re.escape(ind)})" for ind in PYTHON_INDICATORS + BASH_INDICATORS)
+    )
+    
     def __init__(self):
         self.python_sandbox = PythonSandbox()
         self.bash_executor = BashExecutor()
@@ -437,12 +880,10 @@ class CodeExecutor:
         if code.startswith('```bash') or code.startswith('```sh') or code.startswith('#!/bin/bash'):
             return 'bash'
         
-        # Heuristics
-        python_indicators = ['def ', 'import ', 'from ', 'class ', 'print(', 'if __name__']
-        bash_indicators = ['echo ', 'ls ', 'cd ', 'mkdir ', 'grep ', 'cat ', 'wget ', 'curl ']
-        
-        python_score = sum(1 for ind in python_indicators if ind in code)
-        bash_score = sum(1 for ind in bash_indicators if ind in code)
+        # Heuristics: count distinct indicators of each language
+        found = {m.lastindex for m in self._INDICATOR_RE.finditer(code)}
+        python_score = sum(1 for idx in found if idx <= len(self.PYTHON_INDICATORS))
+        bash_score = len(found) - python_score
         
         if python_score > bash_score:
             return 'python'
@@ -458,13 +899,12 @@ class CodeExecutor:
         
         # Remove code fences
         if code.startswith('```'):
-            lines = code.split('\n')
             # Remove first line (```python or similar)
-            lines = lines[1:]
+            _, _, code = code.partition('\n')
             # Remove last line if it's just ```
-            if lines and lines[-1].strip() == '```':
-                lines = lines[:-1]
-            code = '\n'.join(lines)
+            head, _, last = code.rpartition('\n')
+            if last.strip() == '```':
+                code = head
         
         return code.strip()
     
@@ -509,14 +949,10 @@ class CodeExecutor:
 
 
 # Convenience functions
-_executor: Optional[CodeExecutor] = None
-
+@functools.cache
 def get_executor() -> CodeExecutor:
     """Get or create code executor"""
-    global _executor
-    if _executor is None:
-        _executor = CodeExecutor()
-    return _executor
+    return CodeExecutor()
 
 
 def run_python(code: str) -> ExecutionResult:
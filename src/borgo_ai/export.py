@@ -1,6 +1,7 @@
 """
 Export Module - Export conversations to HTML and other formats
 """
+import os
 import json
 import html
 from datetime import datetime
@@ -11,6 +12,18 @@ import re
 from .config import USERS_DIR
 
 
+def write_export(path: str, data: bytes, mode: int = 0o644):
+    """Write an export file straight to its descriptor, normally in a single write()"""
+    flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_CLOEXEC", 0)
+    fd = os.open(path, flags, mode)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+
+
 class HTMLExporter:
     """Export conversations to beautiful HTML"""
     
@@ -287,11 +300,26 @@ class HTMLExporter:
         export_path: Optional[str] = None
     ) -> str:
         """Export a conversation to HTML"""
+        html_content = self.render(messages, title, username)
+        
+        # Save if path provided
+        if export_path:
+            write_export(export_path, html_content.encode('utf-8'))
+        
+        return html_content
+    
+    def render(
+        self,
+        messages: List[Dict],
+        title: str = "Conversation",
+        username: str = "User"
+    ) -> str:
+        """Render a conversation as an HTML page"""
         
         now = datetime.now()
         
         # Build messages HTML
-        messages_html = ""
+        message_parts = []
         for msg in messages:
             role = msg.get("role", "user")
             content = msg.get("content", "")
@@ -308,7 +336,7 @@ class HTMLExporter:
                 except:
                     pass
             
-            messages_html += f"""
+            message_parts.append(f"""
             <div class="message {role}">
                 <div class="message-header">
                     <span class="message-role">{role_display}</span>
@@ -318,7 +346,8 @@ class HTMLExporter:
                     {content_html}
                 </div>
             </div>
-            """
+            """)
+        messages_html = "".join(message_parts)
         
         # Build full HTML
         html_content = f"""<!DOCTYPE html>
@@ -352,10 +381,6 @@ class HTMLExporter:
 </body>
 </html>"""
         
-        # Save if path provided
-        if export_path:
-            Path(export_path).write_text(html_content, encoding='utf-8')
-        
         return html_content
     
     def export_all_conversations(
@@ -377,7 +402,7 @@ class HTMLExporter:
         for conv_info in conversations:
             conv = mm.get_conversation(conv_info["id"])
             if conv:
-                messages = [m.to_dict() for m in conv.messages]
+                messages = conv.to_dict_list()
                 filename = f"conversation_{conv.conversation_id}_{conv.title[:30]}.html"
                 filename = re.sub(r'[^\w\-.]', '_', filename)
                 filepath = output_path / filename
@@ -404,16 +429,30 @@ class MarkdownExporter:
         export_path: Optional[str] = None
     ) -> str:
         """Export a conversation to Markdown"""
+        md_content = self.render(messages, title, username)
+        
+        if export_path:
+            write_export(export_path, md_content.encode('utf-8'))
+        
+        return md_content
+    
+    def render(
+        self,
+        messages: List[Dict],
+        title: str = "Conversation",
+        username: str = "User"
+    ) -> str:
+        """Render a conversation as Markdown"""
         
         now = datetime.now()
         
-        md_content = f"""# {title}
+        parts = [f"""# {title}
 
 *Exported from Borgo-AI on {now.strftime("%B %d, %Y at %H:%M")}*
 
 ---
 
-"""
+"""]
         
         for msg in messages:
             role = msg.get("role", "user")
@@ -430,14 +469,11 @@ class MarkdownExporter:
                 except:
                     pass
             
-            md_content += f"### {role_display}{time_str}\n\n{content}\n\n---\n\n"
+            parts.append(f"### {role_display}{time_str}\n\n{content}\n\n---\n\n")
         
-        md_content += "\n*Generated by Borgo-AI - Local AI Assistant*\n"
+        parts.append("\n*Generated by Borgo-AI - Local AI Assistant*\n")
         
-        if export_path:
-            Path(export_path).write_text(md_content, encoding='utf-8')
-        
-        return md_content
+        return "".join(parts)
 
 
 class JSONExporter:
@@ -463,7 +499,7 @@ class JSONExporter:
         json_content = json.dumps(data, indent=2, ensure_ascii=False)
         
         if export_path:
-            Path(export_path).write_text(json_content, encoding='utf-8')
+            write_export(export_path, json_content.encode('utf-8'))
         
         return json_content
 
@@ -5,12 +5,50 @@ Supports: PDF, TXT, Markdown, HTML, Word docs, CSV, JSON
 import os
 import re
 import json
+import hashlib
+import importlib.util
+import mmap
+import pickle
+import time
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice, repeat
 from pathlib import Path
-from typing import List, Dict, Optional, Tuple
+from typing import List, Dict, Optional, Tuple, Iterator
 from dataclasses import dataclass
 import mimetypes
 
-from .config import KNOWLEDGE_DIR
+from .config import KNOWLEDGE_DIR, CHUNK_CACHE_DIR
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Chunking boundaries: markdown headers, blank lines, sentence ends
+_HEADER_RE = re.compile(r'\n(?=#{1,6}\s)')
+_PARAGRAPH_RE = re.compile(r'\n\s*\n')
+_SENTENCE_RE = re.compile(r'(?<=[.!?])\s+')
+# Crude tag stripper for when BeautifulSoup isn't installed
+_HTML_TAG_RE = re.compile(r'<[^>]+>')
+
+# spaCy's rule-based sentencizer (no model download): None until first use,
+# False if spaCy isn't installed
+_sentencizer = None
+
+
+def _get_sentencizer():
+    """Lazily build a blank English pipeline with just the sentencizer"""
+    global _sentencizer
+    if _sentencizer is None:
+        try:
+            import spacy
+            nlp = spacy.blank("en")
+            nlp.add_pipe("sentencizer")
+            _sentencizer = nlp
+        except ImportError:
+            _sentencizer = False
+    return _sentencizer
 
 
 @dataclass
@@ -64,28 +102,48 @@ class SemanticChunker:
         sections = self._split_into_sections(text)
         
         chunks = []
-        current_chunk = ""
+        # Sections of the chunk being built; current_len counts the "\n\n" after each
+        current: List[str] = []
+        current_len = 0
         
         for section in sections:
             # If section fits in current chunk, add it
-            if len(current_chunk) + len(section) <= self.max_chunk_size:
-                current_chunk += section + "\n\n"
+            if current_len + len(section) <= self.max_chunk_size:
+                current.append(section)
+                current_len += len(section) + 2
             else:
-                # Save current chunk if it has content
-                if current_chunk.strip() and len(current_chunk) >= self.min_chunk_size:
-                    chunks.append(current_chunk.strip())
+                # Save current chunk if it has content; a run too short to stand
+                # alone is carried into the next chunk instead of being dropped
+                chunk_text = "\n\n".join(current).strip()
+                carry = ""
+                if chunk_text:
+                    if current_len >= self.min_chunk_size:
+                        chunks.append(chunk_text)
+                    else:
+                        carry = chunk_text
                 
                 # If section itself is too large, split by sentences
                 if len(section) > self.max_chunk_size:
                     sentence_chunks = self._split_large_section(section)
+                    if carry and sentence_chunks:
+                        sentence_chunks[0] = f"{carry}\n\n{sentence_chunks[0]}"
+                    elif carry:
+                        chunks.append(carry)
                     chunks.extend(sentence_chunks)
-                    current_chunk = ""
+                    current = []
+                    current_len = 0
                 else:
-                    current_chunk = section + "\n\n"
+                    # May overshoot max_chunk_size by less than min_chunk_size
+                    current = [carry, section] if carry else [section]
+                    current_len = sum(len(s) + 2 for s in current)
         
-        # Don't forget the last chunk
-        if current_chunk.strip() and len(current_chunk) >= self.min_chunk_size:
-            chunks.append(current_chunk.strip())
+        # Don't forget the last chunk; if it's too short, fold it into the previous one
+        chunk_text = "\n\n".join(current).strip()
+        if chunk_text:
+            if current_len >= self.min_chunk_size or not chunks:
+                chunks.append(chunk_text)
+            else:
+                chunks[-1] = f"{chunks[-1]}\n\n{chunk_text}"
         
         # Convert to DocumentChunk objects with overlap context
         doc_chunks = []
@@ -108,14 +166,14 @@ class SemanticChunker:
     def _split_into_sections(self, text: str) -> List[str]:
         """Split text by semantic boundaries"""
         # Split by markdown headers
-        sections = re.split(r'\n(?=#{1,6}\s)', text)
+        sections = _HEADER_RE.split(text)
         
         # Further split by double newlines (paragraphs)
         all_sections = []
         for section in sections:
             if len(section) > self.max_chunk_size:
                 # Split by paragraphs
-                paragraphs = re.split(r'\n\s*\n', section)
+                paragraphs = _PARAGRAPH_RE.split(section)
                 all_sections.extend(p.strip() for p in paragraphs if p.strip())
             else:
                 if section.strip():
@@ -126,60 +184,111 @@ class SemanticChunker:
     def _split_large_section(self, text: str) -> List[str]:
         """Split a large section by sentences"""
         # Split by sentence endings
-        sentences = re.split(r'(?<=[.!?])\s+', text)
+        sentences = self._split_sentences(text)
         
         chunks = []
-        current = ""
+        # Sentences of the chunk being built; current_len counts the " " after each
+        current: List[str] = []
+        current_len = 0
         
         for sentence in sentences:
-            if len(current) + len(sentence) <= self.max_chunk_size:
-                current += sentence + " "
+            if current_len + len(sentence) <= self.max_chunk_size:
+                current.append(sentence)
+                current_len += len(sentence) + 1
             else:
-                if current.strip():
-                    chunks.append(current.strip())
-                current = sentence + " "
+                chunk_text = " ".join(current).strip()
+                if chunk_text:
+                    chunks.append(chunk_text)
+                current = [sentence]
+                current_len = len(sentence) + 1
         
-        if current.strip():
-            chunks.append(current.strip())
+        chunk_text = " ".join(current).strip()
+        if chunk_text:
+            chunks.append(chunk_text)
         
         return chunks
     
+    def _split_sentences(self, text: str) -> List[str]:
+        """Split text into sentences, using spaCy when it's installed"""
+        nlp = _get_sentencizer()
+        if nlp and len(text) <= nlp.max_length:
+            # Handles abbreviations, decimals and URLs that trip up the regex
+            sentences = (span.text.strip() for span in nlp(text).sents)
+            return [sentence for sentence in sentences if sentence]
+        return _SENTENCE_RE.split(text)
+    
     def _get_last_sentences(self, text: str, n: int) -> str:
         """Get the last n sentences from text"""
-        sentences = re.split(r'(?<=[.!?])\s+', text)
+        # Only the end matters, so split a growing suffix instead of the whole text.
+        # More than n pieces means the boundary before the last n was in the window
+        window = 256
+        while n > 0 and window < len(text):
+            sentences = self._split_sentences(text[-window:])
+            if len(sentences) > n:
+                return " ".join(sentences[-n:])
+            window *= 4
+        
+        sentences = self._split_sentences(text)
         last_n = sentences[-n:] if len(sentences) >= n else sentences
         return " ".join(last_n)
 
 
+# Loader method for each supported extension, bound per DocumentLoader instance
+_EXTENSION_LOADERS = {
+    '.txt': '_load_text',
+    '.md': '_load_text',
+    '.markdown': '_load_text',
+    '.py': '_load_code',
+    '.js': '_load_code',
+    '.ts': '_load_code',
+    '.java': '_load_code',
+    '.cpp': '_load_code',
+    '.c': '_load_code',
+    '.h': '_load_code',
+    '.json': '_load_json',
+    '.csv': '_load_csv',
+    '.html': '_load_html',
+    '.htm': '_load_html',
+    '.pdf': '_load_pdf',
+    '.docx': '_load_docx',
+}
+
+
 class DocumentLoader:
     """Load various document types"""
     
-    def __init__(self):
+    # Text files above this size are decoded straight from a memory map
+    MMAP_THRESHOLD = 1 << 20
+    # Pages each process should get before a PDF is worth extracting in parallel
+    PDF_PAGES_PER_WORKER = 50
+    # Bytes each process should get before a directory is worth loading in parallel
+    # (a spawned worker costs a fresh interpreter and re-import of this package)
+    DIRECTORY_BYTES_PER_WORKER = 8 * 1024 * 1024
+    
+    # Bump when loader or chunker output changes, to invalidate cached chunks
+    CACHE_VERSION = 3
+    # Cache entries unused for this long are removed, then the oldest go until
+    # the directory fits in CACHE_MAX_BYTES
+    CACHE_MAX_AGE = 30 * 24 * 3600
+    CACHE_MAX_BYTES = 256 * 1024 * 1024
+    
+    def __init__(self, cache_dir: Optional[Path] = CHUNK_CACHE_DIR):
         self.chunker = SemanticChunker()
+        # Extracted content and chunks per file version; None disables caching
+        self.cache_dir = cache_dir
+        self._cache_pruned = False
         self.supported_extensions = {
-            '.txt': self._load_text,
-            '.md': self._load_text,
-            '.markdown': self._load_text,
-            '.py': self._load_code,
-            '.js': self._load_code,
-            '.ts': self._load_code,
-            '.java': self._load_code,
-            '.cpp': self._load_code,
-            '.c': self._load_code,
-            '.h': self._load_code,
-            '.json': self._load_json,
-            '.csv': self._load_csv,
-            '.html': self._load_html,
-            '.htm': self._load_html,
-            '.pdf': self._load_pdf,
-            '.docx': self._load_docx,
+            ext: getattr(self, name) for ext, name in _EXTENSION_LOADERS.items()
         }
     
     def load(self, filepath: str) -> LoadedDocument:
         """Load a document from file"""
         path = Path(filepath)
         
-        if not path.exists():
+        # One stat both checks existence and gets the size
+        try:
+            st = path.stat()
+        except FileNotFoundError:
             return LoadedDocument(
                 filename=path.name,
                 filepath=str(path),
@@ -191,10 +300,11 @@ class DocumentLoader:
                 error=f"File not found: {filepath}"
             )
         
+        size = st.st_size
         ext = path.suffix.lower()
-        size = path.stat().st_size
+        loader_func = self.supported_extensions.get(ext)
         
-        if ext not in self.supported_extensions:
+        if loader_func is None:
             return LoadedDocument(
                 filename=path.name,
                 filepath=str(path),
@@ -207,16 +317,21 @@ class DocumentLoader:
             )
         
         try:
-            loader_func = self.supported_extensions[ext]
-            content = loader_func(path)
-            
-            # Chunk the content
-            metadata = {
-                "source": path.name,
-                "filepath": str(path),
-                "file_type": ext
-            }
-            chunks = self.chunker.chunk(content, metadata)
+            cache_file = self._cache_file(path, st)
+            cached = self._read_cache(cache_file)
+            if cached is not None:
+                content, chunks = cached
+            else:
+                content = loader_func(path)
+                
+                # Chunk the content
+                metadata = {
+                    "source": path.name,
+                    "filepath": str(path),
+                    "file_type": ext
+                }
+                chunks = self.chunker.chunk(content, metadata)
+                self._write_cache(cache_file, (content, chunks))
             
             return LoadedDocument(
                 filename=path.name,
@@ -240,10 +355,93 @@ class DocumentLoader:
                 error=str(e)
             )
     
+    def _cache_file(self, path: Path, st: os.stat_result) -> Optional[Path]:
+        """Cache entry for this exact version of a file under the current settings"""
+        if self.cache_dir is None:
+            return None
+        
+        chunker = self.chunker
+        key = "\0".join(map(str, (
+            self.CACHE_VERSION, path, path.resolve(), st.st_size, st.st_mtime_ns,
+            chunker.max_chunk_size, chunker.min_chunk_size, chunker.overlap_sentences,
+            # Sentence splitting differs with spaCy installed
+            importlib.util.find_spec("spacy") is not None,
+        )))
+        return Path(self.cache_dir) / f"{hashlib.blake2b(key.encode(), digest_size=16).hexdigest()}.pkl"
+    
+    def _read_cache(self, cache_file: Optional[Path]) -> Optional[Tuple[str, List[DocumentChunk]]]:
+        """Return cached (content, chunks), or None on a miss"""
+        if cache_file is None:
+            return None
+        try:
+            with open(cache_file, 'rb') as f:
+                entry = pickle.load(f)
+        except Exception:
+            return None  # Missing or unreadable entry: a miss, rebuilt and overwritten
+        try:
+            os.utime(cache_file)  # Mark as recently used, for pruning
+        except OSError:
+            pass
+        return entry
+    
+    def _write_cache(self, cache_file: Optional[Path], entry: Tuple[str, List[DocumentChunk]]):
+        """Store (content, chunks), swapping the file in atomically"""
+        if cache_file is None:
+            return
+        tmp_file = cache_file.with_name(f"{cache_file.name}.{os.getpid()}.tmp")
+        try:
+            with open(tmp_file, 'wb') as f:
+                pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_file, cache_file)
+        except OSError:
+            pass  # Caching is best-effort
+        
+        # Once per loader, so the directory is scanned at most once per session
+        if not self._cache_pruned:
+            self._cache_pruned = True
+            self._prune_cache()
+    
+    def _prune_cache(self):
+        """Drop stale cache entries, then the least recently used ones over the size bound"""
+        entries = []
+        try:
+            with os.scandir(self.cache_dir) as it:
+                for entry in it:
+                    try:
+                        st = entry.stat()
+                    except OSError:
+                        continue
+                    entries.append((st.st_mtime, st.st_size, entry.path))
+        except OSError:
+            return
+        
+        cutoff = time.time() - self.CACHE_MAX_AGE
+        total = sum(size for _, size, _ in entries)
+        for mtime, size, filepath in sorted(entries):
+            if mtime >= cutoff and total <= self.CACHE_MAX_BYTES:
+                break
+            try:
+                os.remove(filepath)
+            except OSError:
+                continue
+            total -= size
+    
     def _load_text(self, path: Path) -> str:
         """Load plain text file"""
-        with open(path, 'r', encoding='utf-8', errors='ignore') as f:
-            return f.read()
+        with open(path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size > self.MMAP_THRESHOLD:
+                # Decode from the mapped pages instead of reading into a bytes copy first
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    if hasattr(mapped, 'madvise') and hasattr(mmap, 'MADV_SEQUENTIAL'):
+                        mapped.madvise(mmap.MADV_SEQUENTIAL)
+                    text = str(mapped, 'utf-8', 'ignore')
+            else:
+                text = f.read().decode('utf-8', 'ignore')
+        
+        # Same universal-newline handling as a text-mode read
+        if '\r' in text:
+            text = text.replace('\r\n', '\n').replace('\r', '\n')
+        return text
     
     def _load_code(self, path: Path) -> str:
         """Load code file with language annotation"""
@@ -253,9 +451,21 @@ class DocumentLoader:
     
     def _load_json(self, path: Path) -> str:
         """Load JSON file"""
-        with open(path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        return f"JSON content from {path.name}:\n```json\n{json.dumps(data, indent=2)}\n```"
+        with open(path, 'rb') as f:
+            raw = f.read()
+        
+        data = json.loads(raw)
+        pretty = None
+        # orjson writes NaN/Infinity as null, so only trust it when they can't be present
+        if orjson is not None and b'NaN' not in raw and b'Infinity' not in raw:
+            try:
+                pretty = orjson.dumps(data, option=orjson.OPT_INDENT_2).decode()
+            except orjson.JSONEncodeError:
+                pass  # e.g. integers beyond 64 bits
+        if pretty is None:
+            pretty = json.dumps(data, indent=2)
+        
+        return f"JSON content from {path.name}:\n```json\n{pretty}\n```"
     
     def _load_csv(self, path: Path) -> str:
         """Load CSV file"""
@@ -263,34 +473,58 @@ class DocumentLoader:
             import csv
             with open(path, 'r', encoding='utf-8', errors='ignore') as f:
                 reader = csv.reader(f)
-                rows = list(reader)
-            
-            if not rows:
-                return "Empty CSV file"
+                header = next(reader, None)
+                if header is None:
+                    return "Empty CSV file"
+                
+                # Only the first rows are shown; the rest are counted, never stored
+                body = list(islice(reader, 49))
+                total_rows = 1 + len(body) + sum(1 for _ in reader)
             
             # Format as markdown table
-            header = rows[0]
-            content = f"CSV data from {path.name}:\n\n"
-            content += "| " + " | ".join(header) + " |\n"
-            content += "| " + " | ".join(["---"] * len(header)) + " |\n"
+            parts = [
+                f"CSV data from {path.name}:\n\n",
+                "| " + " | ".join(header) + " |\n",
+                "| " + " | ".join(["---"] * len(header)) + " |\n",
+            ]
+            for row in body:
+                parts.append("| " + " | ".join(str(cell)[:50] for cell in row) + " |\n")
             
-            for row in rows[1:50]:  # Limit to first 50 rows
-                content += "| " + " | ".join(str(cell)[:50] for cell in row) + " |\n"
-            
-            if len(rows) > 51:
-                content += f"\n... and {len(rows) - 51} more rows"
+            if total_rows > 51:
+                parts.append(f"\n... and {total_rows - 51} more rows")
             
+            content = "".join(parts)
             return content
         except Exception as e:
-            return f"Error loading CSV: {e}"
+            raise ValueError(f"Error loading CSV: {e}") from e
     
     def _load_html(self, path: Path) -> str:
         """Load HTML file and extract text"""
+        content = self._load_text(path)
+        
+        try:
+            # selectolax's C parser is much faster than BeautifulSoup for plain text extraction
+            from selectolax.parser import HTMLParser
+        except ImportError:
+            HTMLParser = None
+        
+        if HTMLParser is not None:
+            tree = HTMLParser(content)
+            
+            # Remove scripts and styles
+            for node in tree.css('script, style, nav, footer'):
+                node.decompose()
+            
+            title_node = tree.css_first('title')
+            title = title_node.text() if title_node else path.name
+            text = tree.root.text(separator='\n', strip=True) if tree.root else ""
+            
+            return f"# {title}\n\n{text}"
+        
         try:
             from bs4 import BeautifulSoup
             
-            with open(path, 'r', encoding='utf-8', errors='ignore') as f:
-                soup = BeautifulSoup(f.read(), 'html.parser')
+            soup = BeautifulSoup(content, 'html.parser')
             
             # Remove scripts and styles
             for tag in soup(['script', 'style', 'nav', 'footer']):
@@ -301,11 +535,8 @@ class DocumentLoader:
             
             return f"# {title}\n\n{text}"
         except ImportError:
-            # Fallback without BeautifulSoup
-            content = self._load_text(path)
-            # Basic HTML tag removal
-            content = re.sub(r'<[^>]+>', '', content)
-            return content
+            # Fallback without an HTML parser: basic tag removal
+            return _HTML_TAG_RE.sub('', content)
     
     def _load_pdf(self, path: Path) -> str:
         """Load PDF file"""
@@ -313,19 +544,42 @@ class DocumentLoader:
             import pypdf
             
             reader = pypdf.PdfReader(str(path))
-            text_parts = []
-            
-            for i, page in enumerate(reader.pages):
-                text = page.extract_text()
-                if text:
-                    text_parts.append(f"--- Page {i+1} ---\n{text}")
-            
-            return f"# PDF: {path.name}\n\n" + "\n\n".join(text_parts)
+            pages = "\n\n".join(self._iter_pdf_pages(path, reader))
+            return f"# PDF: {path.name}\n\n{pages}"
         
         except ImportError:
-            return f"PDF support requires pypdf. Install with: pip install pypdf"
+            raise ImportError("PDF support requires pypdf. Install with: pip install pypdf") from None
         except Exception as e:
-            return f"Error loading PDF: {e}"
+            raise ValueError(f"Error loading PDF: {e}") from e
+    
+    def _iter_pdf_pages(self, path: Path, reader) -> Iterator[str]:
+        """Yield the text of each non-empty page, one page at a time"""
+        page_count = len(reader.pages)
+        workers = min(os.cpu_count() or 1, page_count // self.PDF_PAGES_PER_WORKER)
+        
+        # Big PDFs are split into page ranges across processes (extraction is
+        # GIL-bound and a reader isn't thread-safe); not from inside a worker
+        texts = None
+        if workers >= 2 and multiprocessing.parent_process() is None:
+            step = -(-page_count // workers)
+            starts = range(0, page_count, step)
+            stops = [min(start + step, page_count) for start in starts]
+            try:
+                with ProcessPoolExecutor(
+                    max_workers=workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                ) as pool:
+                    chunks = pool.map(_extract_pdf_range, repeat(str(path)), starts, stops)
+                    texts = [text for chunk in chunks for text in chunk]
+            except (OSError, RuntimeError):
+                texts = None  # No subprocesses available: extract here instead
+        
+        if texts is None:
+            texts = (page.extract_text() for page in reader.pages)
+        
+        for i, text in enumerate(texts):
+            if text:
+                yield f"--- Page {i+1} ---\n{text}"
     
     def _load_docx(self, path: Path) -> str:
         """Load Word document"""
@@ -347,35 +601,95 @@ class DocumentLoader:
             return f"# Document: {path.name}\n\n" + "\n\n".join(paragraphs)
         
         except ImportError:
-            return f"Word support requires python-docx. Install with: pip install python-docx"
+            raise ImportError("Word support requires python-docx. Install with: pip install python-docx") from None
         except Exception as e:
-            return f"Error loading Word document: {e}"
+            raise ValueError(f"Error loading Word document: {e}") from e
     
     def load_directory(self, dirpath: str, recursive: bool = True) -> List[LoadedDocument]:
         """Load all supported documents from a directory"""
-        path = Path(dirpath)
-        documents = []
-        
-        if not path.exists():
-            return documents
+        files = list(self._iter_supported_files(dirpath, recursive))
+        filepaths = [filepath for filepath, _ in files]
         
-        pattern = "**/*" if recursive else "*"
+        total_bytes = sum(size for _, size in files)
+        workers = min(len(files), os.cpu_count() or 1, total_bytes // self.DIRECTORY_BYTES_PER_WORKER)
+        if workers < 2:
+            return [self.load(filepath) for filepath in filepaths]
         
-        for file_path in path.glob(pattern):
-            if file_path.is_file() and file_path.suffix.lower() in self.supported_extensions:
-                doc = self.load(str(file_path))
-                documents.append(doc)
+        # Extraction is CPU-bound (pypdf, python-docx, bs4), so spread files over
+        # processes. Largest first, so a big PDF doesn't start last and set the tail
+        by_size = [filepath for filepath, _ in sorted(files, key=lambda f: f[1], reverse=True)]
+        try:
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker_loader,
+                initargs=(self,),
+            ) as pool:
+                loaded = dict(zip(by_size, pool.map(_load_in_worker, by_size)))
+        except (OSError, RuntimeError):
+            # No subprocesses available (sandboxed or restricted environment)
+            return [self.load(filepath) for filepath in filepaths]
         
-        return documents
+        # Hand documents back in directory order, not scheduling order
+        return [loaded[filepath] for filepath in filepaths]
+    
+    def _iter_supported_files(self, dirpath: str, recursive: bool) -> Iterator[Tuple[str, int]]:
+        """Yield (path, size) for each supported file, skipping hidden directories"""
+        # scandir's entries already know their type, so only matching files get a stat
+        pending = [dirpath]
+        while pending:
+            try:
+                entries = os.scandir(pending.pop())
+            except OSError:
+                continue  # Missing, not a directory, or unreadable
+            
+            with entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        if recursive and not entry.name.startswith('.'):
+                            pending.append(entry.path)
+                    elif (os.path.splitext(entry.name)[1].lower() in self.supported_extensions
+                          and entry.is_file()):
+                        yield entry.path, entry.stat().st_size
+
+
+# The parent's loader, copied into each load_directory worker process
+_worker_loader: Optional[DocumentLoader] = None
+
+
+def _init_worker_loader(loader: DocumentLoader):
+    global _worker_loader
+    _worker_loader = loader
+
+
+def _load_in_worker(filepath: str) -> LoadedDocument:
+    return _worker_loader.load(filepath)
+
+
+def _extract_pdf_range(filepath: str, start: int, stop: int) -> List[str]:
+    """Extract the text of pages [start, stop) of a PDF"""
+    import pypdf
+    
+    reader = pypdf.PdfReader(filepath)
+    return [reader.pages[i].extract_text() for i in range(start, stop)]
+
+
+# Shared loader for the convenience functions
+_default_loader: Optional[DocumentLoader] = None
+
+def _get_default_loader() -> DocumentLoader:
+    """Get or create the shared DocumentLoader"""
+    global _default_loader
+    if _default_loader is None:
+        _default_loader = DocumentLoader()
+    return _default_loader
 
 
 def load_file(filepath: str) -> LoadedDocument:
     """Convenience function to load a file"""
-    loader = DocumentLoader()
-    return loader.load(filepath)
+    return _get_default_loader().load(filepath)
 
 
 def load_directory(dirpath: str, recursive: bool = True) -> List[LoadedDocument]:
     """Convenience function to load a directory"""
-    loader = DocumentLoader()
-    return loader.load_directory(dirpath, recursive)
+    return _get_default_loader().load_directory(dirpath, recursive)
@@ -3,11 +3,29 @@ LLM Module - Ollama Integration for borgo-ai
 Optimized for local inference on RTX 3060 Ti
 """
 import requests
+from requests.adapters import HTTPAdapter
 import json
 from typing import Generator, Optional, List, Dict, Any
 from dataclasses import dataclass
 from .config import llm_config
 
+# Every streamed token is one JSON line, so use orjson's C parser when available
+try:
+    import orjson
+    _json_loads = orjson.loads
+    _json_dumps = orjson.dumps
+except ImportError:
+    _json_loads = json.loads
+    
+    def _json_dumps(data) -> bytes:
+        return json.dumps(data).encode()
+
+# Optional: pull just the model names out of /api/tags as the bytes arrive
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
 
 @dataclass
 class Message:
@@ -26,14 +44,25 @@ class OllamaLLM:
         self.config = config or llm_config
         self.base_url = self.config.base_url
         self.model = self.config.model
+        # One keep-alive session, so each call skips a fresh TCP handshake
+        self.session = requests.Session()
+        # Sized for the largest `ask-batch --parallel`
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
         
+    def close(self):
+        """Release the pooled connections"""
+        self.session.close()
+    
     def _make_request(self, endpoint: str, data: dict, stream: bool = False):
         """Make request to Ollama API"""
         url = f"{self.base_url}/{endpoint}"
         try:
-            response = requests.post(
+            response = self.session.post(
                 url,
-                json=data,
+                data=_json_dumps(data),
+                headers={"Content-Type": "application/json"},
                 stream=stream,
                 timeout=600  # 10 minutes for large models
             )
@@ -47,30 +76,43 @@ class OllamaLLM:
         except requests.exceptions.Timeout:
             raise TimeoutError("Request to Ollama timed out (10min limit)")
     
+    def list_models(self) -> List[str]:
+        """Names of the models installed in Ollama"""
+        # Short connect timeout: Ollama is local, so a slow connect means it's down
+        response = self.session.get(
+            f"{self.base_url}/api/tags", timeout=(1.0, 5.0), stream=ijson is not None
+        )
+        response.raise_for_status()
+        if ijson is not None:
+            # Reading to the end of the document hands the connection back to the pool
+            with response:
+                response.raw.decode_content = True
+                return list(ijson.items(response.raw, "models.item.name"))
+        # _json_loads is orjson's parser when it's installed
+        return [m.get("name", "") for m in _json_loads(response.content).get("models", [])]
+    
     def check_model_available(self) -> bool:
         """Check if the model is available locally"""
         try:
-            response = requests.get(f"{self.base_url}/api/tags", timeout=5)
-            if response.status_code == 200:
-                models = response.json().get("models", [])
-                return any(m.get("name", "").startswith(self.model.split(":")[0]) 
-                          for m in models)
-            return False
+            base = self.model.split(":")[0]
+            return any(name.startswith(base) for name in self.list_models())
         except:
             return False
     
     def pull_model(self) -> Generator[str, None, None]:
         """Pull the model if not available"""
+        for data in self.pull_progress():
+            status = data.get("status", "")
+            yield status
+    
+    def pull_progress(self, model: Optional[str] = None) -> Generator[dict, None, None]:
+        """Pull a model, yielding Ollama's progress records (status, completed, total)"""
         response = self._make_request(
             "api/pull",
-            {"name": self.model},
+            {"name": model or self.model},
             stream=True
         )
-        for line in response.iter_lines():
-            if line:
-                data = json.loads(line)
-                status = data.get("status", "")
-                yield status
+        yield from self._iter_json_lines(response)
     
     def generate(
         self,
@@ -83,6 +125,7 @@ class OllamaLLM:
             "model": self.model,
             "prompt": prompt,
             "stream": stream,
+            "keep_alive": self.config.keep_alive,
             "options": {
                 "temperature": self.config.temperature,
                 "num_predict": self.config.max_tokens,
@@ -99,7 +142,7 @@ class OllamaLLM:
         if stream:
             return self._stream_response(response)
         else:
-            return response.json().get("response", "")
+            return _json_loads(response.content).get("response", "")
     
     def chat(
         self,
@@ -111,6 +154,7 @@ class OllamaLLM:
             "model": self.model,
             "messages": [m.to_dict() for m in messages],
             "stream": stream,
+            "keep_alive": self.config.keep_alive,
             "options": {
                 "temperature": self.config.temperature,
                 "num_predict": self.config.max_tokens,
@@ -124,29 +168,59 @@ class OllamaLLM:
         if stream:
             return self._stream_chat_response(response)
         else:
-            return response.json().get("message", {}).get("content", "")
+            return _json_loads(response.content).get("message", {}).get("content", "")
+    
+    def warm_up(self, system_prompt: str):
+        """Load the model and prefill a system prompt so later chats reuse it"""
+        # Ollama keeps the evaluated prompt around for keep_alive and skips
+        # re-evaluating any matching prefix of the next request
+        data = {
+            "model": self.model,
+            "messages": [{"role": "system", "content": system_prompt}],
+            "stream": False,
+            "keep_alive": self.config.keep_alive,
+            "options": {"num_predict": 1}
+        }
+        self._make_request("api/chat", data)
     
     def _stream_response(self, response) -> Generator[str, None, None]:
         """Stream response tokens"""
-        for line in response.iter_lines():
-            if line:
-                data = json.loads(line)
-                token = data.get("response", "")
-                if token:
-                    yield token
-                if data.get("done", False):
-                    break
+        for data in self._iter_json_lines(response):
+            token = data.get("response", "")
+            if token:
+                yield token
+            if data.get("done", False):
+                break
     
     def _stream_chat_response(self, response) -> Generator[str, None, None]:
         """Stream chat response tokens"""
-        for line in response.iter_lines():
-            if line:
-                data = json.loads(line)
-                token = data.get("message", {}).get("content", "")
-                if token:
-                    yield token
-                if data.get("done", False):
+        for data in self._iter_json_lines(response):
+            token = data.get("message", {}).get("content", "")
+            if token:
+                yield token
+            if data.get("done", False):
+                break
+    
+    def _iter_json_lines(self, response) -> Generator[dict, None, None]:
+        """Parse an NDJSON response straight from its raw bytes"""
+        # Splitting a byte buffer ourselves skips iter_lines' per-line decode and
+        # copies; both orjson and json parse bytes directly
+        buffer = bytearray()
+        for chunk in response.iter_content(chunk_size=4096):
+            buffer += chunk
+            start = 0
+            while True:
+                end = buffer.find(b"\n", start)
+                if end < 0:
                     break
+                line = buffer[start:end]
+                start = end + 1
+                if line.strip():
+                    yield _json_loads(line)
+            del buffer[:start]
+        
+        if buffer.strip():
+            yield _json_loads(buffer)
     
     def should_search(self, query: str) -> bool:
         """Determine if the AI should search the web for this query"""
@@ -182,7 +256,7 @@ def ask_llm(
     stream: bool = True
 ) -> Generator[str, None, None] | str:
     """Simple function to ask the LLM"""
-    llm = OllamaLLM()
+    llm = get_llm()
     return llm.generate(prompt, system_prompt, stream)
 
 
@@ -191,7 +265,7 @@ def chat_llm(
     stream: bool = True
 ) -> Generator[str, None, None] | str:
     """Chat with message history"""
-    llm = OllamaLLM()
+    llm = get_llm()
     msg_objects = [Message(m["role"], m["content"]) for m in messages]
     return llm.chat(msg_objects, stream)
 
@@ -204,4 +278,7 @@ def get_llm() -> OllamaLLM:
     global _llm_instance
     if _llm_instance is None:
         _llm_instance = OllamaLLM()
+    else:
+        # Pick up model switches made through llm_config (e.g. /model)
+        _llm_instance.model = _llm_instance.config.model
     return _llm_instance
\ No newline at end of file
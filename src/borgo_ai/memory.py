@@ -1,14 +1,13 @@
 """
 Memory Module - Conversation memory and persistence for borgo-ai
 """
-import json
 from typing import List, Dict, Optional, Any
 from pathlib import Path
 from datetime import datetime
 from dataclasses import dataclass, field, asdict
 import uuid
 
-from .config import USERS_DIR, memory_config
+from .config import USERS_DIR, memory_config, _dump_json, _load_json
 from .embeddings import FAISSIndex, get_embedder, embed_text, embedding_config
 
 
@@ -21,7 +20,13 @@ class ChatMessage:
     message_id: str = field(default_factory=lambda: str(uuid.uuid4())[:8])
     
     def to_dict(self) -> dict:
-        return asdict(self)
+        # Same keys as asdict(), without its recursive deep copy
+        return {
+            "role": self.role,
+            "content": self.content,
+            "timestamp": self.timestamp,
+            "message_id": self.message_id
+        }
     
     @classmethod
     def from_dict(cls, data: dict) -> "ChatMessage":
@@ -36,17 +41,28 @@ class Conversation:
     messages: List[ChatMessage] = field(default_factory=list)
     created_at: str = field(default_factory=lambda: datetime.now().isoformat())
     updated_at: str = field(default_factory=lambda: datetime.now().isoformat())
+    # Serialized messages, extended as messages are added (see to_dict_list)
+    _dict_cache: Optional[List[dict]] = field(default=None, init=False, repr=False, compare=False)
     
     def add_message(self, role: str, content: str):
         """Add a message to the conversation"""
-        self.messages.append(ChatMessage(role=role, content=content))
+        message = ChatMessage(role=role, content=content)
+        self.messages.append(message)
+        if self._dict_cache is not None:
+            self._dict_cache.append(message.to_dict())
         self.updated_at = datetime.now().isoformat()
     
+    def to_dict_list(self) -> List[dict]:
+        """Messages as dicts, built once and then kept up to date. Don't mutate the result."""
+        if self._dict_cache is None or len(self._dict_cache) != len(self.messages):
+            self._dict_cache = [m.to_dict() for m in self.messages]
+        return self._dict_cache
+    
     def to_dict(self) -> dict:
         return {
             "conversation_id": self.conversation_id,
             "title": self.title,
-            "messages": [m.to_dict() for m in self.messages],
+            "messages": self.to_dict_list(),
             "created_at": self.created_at,
             "updated_at": self.updated_at
         }
@@ -104,16 +120,16 @@ class MemoryManager:
         """Load all saved data"""
         # Load conversations
         if self.conversations_file.exists():
-            with open(self.conversations_file) as f:
-                data = json.load(f)
+            with open(self.conversations_file, "rb") as f:
+                data = _load_json(f.read())
                 for conv_data in data.get("conversations", []):
                     conv = Conversation.from_dict(conv_data)
                     self.conversations[conv.conversation_id] = conv
         
         # Load memories
         if self.memories_file.exists():
-            with open(self.memories_file) as f:
-                data = json.load(f)
+            with open(self.memories_file, "rb") as f:
+                data = _load_json(f.read())
                 self.memories = [Memory.from_dict(m) for m in data.get("memories", [])]
         
         # Load memory index
@@ -130,16 +146,17 @@ class MemoryManager:
         data = {
             "conversations": [c.to_dict() for c in self.conversations.values()]
         }
-        with open(self.conversations_file, "w") as f:
-            json.dump(data, f, indent=2)
+        # Runs after every message; one serialized buffer, one write
+        with open(self.conversations_file, "wb") as f:
+            f.write(_dump_json(data))
     
     def _save_memories(self):
         """Save memories to disk"""
         data = {
             "memories": [m.to_dict() for m in self.memories]
         }
-        with open(self.memories_file, "w") as f:
-            json.dump(data, f, indent=2)
+        with open(self.memories_file, "wb") as f:
+            f.write(_dump_json(data))
     
     def _rebuild_memory_index(self):
         """Rebuild the memory vector index"""
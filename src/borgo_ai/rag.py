@@ -1,7 +1,7 @@
 """
 RAG Module - Retrieval Augmented Generation for borgo-ai
 """
-from typing import List, Optional, Dict
+from typing import List, Optional, Dict, Union
 from pathlib import Path
 import json
 
@@ -39,15 +39,18 @@ class KnowledgeBase:
     
     def add_document(
         self, 
-        content: str, 
+        content: Union[str, List[str]], 
         source: str = "unknown",
         metadata: Optional[dict] = None
     ):
-        """Add a document to the knowledge base"""
+        """Add a document (raw text, or a list of already-made chunks) to the knowledge base"""
         embedder = get_embedder()
         
         # Chunk the document
-        chunks = self.chunker.chunk_text(content)
+        if isinstance(content, str):
+            chunks = self.chunker.chunk_text(content)
+        else:
+            chunks = [chunk for chunk in content if chunk.strip()]
         
         if not chunks:
             return
@@ -212,11 +215,11 @@ def build_rag_prompt(
 
 
 def add_knowledge(
-    content: str, 
+    content: Union[str, List[str]], 
     source: str = "user",
     kb_name: str = "default"
 ):
-    """Add content to knowledge base"""
+    """Add content (text or pre-split chunks) to knowledge base"""
     kb = KnowledgeBase(kb_name)
     kb.add_document(content, source)
 
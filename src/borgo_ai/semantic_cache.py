@@ -0,0 +1,213 @@
+"""
+Semantic Cache Module - Reuse answers to near-duplicate questions for borgo-ai
+Random-projection LSH over query embeddings, plus a SQLite-backed cache
+for one-shot commands
+"""
+import os
+import sqlite3
+import time
+from collections import OrderedDict, defaultdict
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+
+class LSHCache:
+    """
+    Approximate nearest-neighbour cache keyed on embedding vectors.
+
+    Each table hashes a vector to the sign pattern of its projection onto
+    `bits` random hyperplanes, so similar vectors tend to share a bucket in
+    at least one table. Candidates from the matching buckets are then
+    checked with an exact cosine similarity.
+    """
+
+    def __init__(
+        self,
+        dim: int,
+        n_tables: int = 8,
+        bits: int = 16,
+        max_entries: int = 512,
+        seed: int = 0
+    ):
+        self.dim = dim
+        self.max_entries = max_entries
+        self.n_tables = n_tables
+        self.bits = bits
+        rng = np.random.default_rng(seed)
+        # All tables' hyperplanes in one matrix, so hashing is a single matrix-vector product
+        self.planes = rng.standard_normal((n_tables * bits, dim)).astype(np.float32)
+        self._powers = 1 << np.arange(bits, dtype=np.int64)
+        self.tables: List[Dict[int, List[int]]] = [defaultdict(list) for _ in range(n_tables)]
+        # Unit vectors live in one preallocated matrix so candidates are scored together
+        self._vectors = np.zeros((max_entries, dim), dtype=np.float32)
+        self._free_rows = list(range(max_entries - 1, -1, -1))
+        # entry id -> (row in _vectors, bucket keys, value), oldest first
+        self._entries: "OrderedDict[int, Tuple[int, List[int], Any]]" = OrderedDict()
+        self._next_id = 0
+
+    def _normalize(self, vec: np.ndarray) -> Optional[np.ndarray]:
+        vec = np.asarray(vec, dtype=np.float32).ravel()
+        norm = np.linalg.norm(vec)
+        if vec.shape[0] != self.dim or norm == 0:
+            return None
+        return vec / norm
+
+    def _hash(self, unit: np.ndarray) -> List[int]:
+        """One bucket key per table"""
+        signs = (self.planes @ unit > 0).reshape(self.n_tables, self.bits)
+        return (signs @ self._powers).tolist()
+
+    def put(self, vec: np.ndarray, value: Any):
+        """Store a value under an embedding"""
+        unit = self._normalize(vec)
+        if unit is None:
+            return
+
+        if not self._free_rows:
+            self._evict_oldest()
+        row = self._free_rows.pop()
+        self._vectors[row] = unit
+
+        keys = self._hash(unit)
+        entry_id = self._next_id
+        self._next_id += 1
+        for table, key in zip(self.tables, keys):
+            table[key].append(entry_id)
+        self._entries[entry_id] = (row, keys, value)
+
+    def get(self, vec: np.ndarray, threshold: float = 0.95) -> Optional[Any]:
+        """Return the most similar cached value with cosine >= threshold"""
+        unit = self._normalize(vec)
+        if unit is None or not self._entries:
+            return None
+
+        candidates = set()
+        for table, key in zip(self.tables, self._hash(unit)):
+            bucket = table.get(key)
+            if bucket:
+                candidates.update(bucket)
+
+        if not candidates:
+            return None
+
+        entries = [self._entries[entry_id] for entry_id in candidates]
+        rows = np.fromiter((entry[0] for entry in entries), dtype=np.intp, count=len(entries))
+        sims = self._vectors[rows] @ unit
+        best = int(np.argmax(sims))
+        if sims[best] < threshold:
+            return None
+        return entries[best][2]
+
+    def _evict_oldest(self):
+        entry_id, (row, keys, _) = self._entries.popitem(last=False)
+        self._free_rows.append(row)
+        for table, key in zip(self.tables, keys):
+            bucket = table[key]
+            bucket.remove(entry_id)
+            if not bucket:
+                del table[key]
+
+    def clear(self):
+        """Drop every cached entry"""
+        for table in self.tables:
+            table.clear()
+        self._entries.clear()
+        self._free_rows = list(range(self.max_entries - 1, -1, -1))
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class ResponseCache:
+    """
+    Persistent answer cache keyed on query embeddings.
+
+    Used by one-shot commands, where an in-memory LSHCache would start empty
+    on every run. Rows are scoped to a (model, prompt_version) pair, so a
+    model switch or a change to the prompt simply stops matching old rows.
+    The cache is small enough that a brute-force cosine scan is cheaper than
+    maintaining an index.
+    """
+
+    def __init__(self, path, max_entries: int = 512):
+        self.max_entries = max_entries
+        self._conn = sqlite3.connect(str(path))
+        # WAL lets concurrent `ask` runs read while another one writes
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "id INTEGER PRIMARY KEY, model TEXT NOT NULL, prompt_version TEXT NOT NULL, "
+            "embedding BLOB NOT NULL, prompt TEXT NOT NULL, response TEXT NOT NULL, "
+            "created REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS responses_scope ON responses (model, prompt_version)"
+        )
+
+    @staticmethod
+    def _unit(vec: np.ndarray) -> Optional[np.ndarray]:
+        vec = np.asarray(vec, dtype=np.float32).ravel()
+        norm = np.linalg.norm(vec)
+        if norm == 0:
+            return None
+        return vec / norm
+
+    def get(
+        self,
+        vec: np.ndarray,
+        model: str,
+        prompt_version: str,
+        threshold: float = 0.92
+    ) -> Optional[str]:
+        """Return the cached response most similar to vec with cosine >= threshold"""
+        unit = self._unit(vec)
+        if unit is None:
+            return None
+
+        # Matching the blob length skips rows from an embedding model of another size
+        rows = self._conn.execute(
+            "SELECT embedding, response FROM responses "
+            "WHERE model = ? AND prompt_version = ? AND length(embedding) = ?",
+            (model, prompt_version, unit.nbytes)
+        ).fetchall()
+        if not rows:
+            return None
+
+        matrix = np.frombuffer(b"".join(row[0] for row in rows), dtype=np.float32)
+        sims = matrix.reshape(len(rows), unit.shape[0]) @ unit
+        best = int(np.argmax(sims))
+        if sims[best] < threshold:
+            return None
+        return rows[best][1]
+
+    def put(self, vec: np.ndarray, prompt: str, response: str, model: str, prompt_version: str):
+        """Store a response, dropping the oldest rows beyond max_entries"""
+        unit = self._unit(vec)
+        if unit is None:
+            return
+
+        with self._conn:
+            self._conn.execute(
+                "INSERT INTO responses (model, prompt_version, embedding, prompt, response, created) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (model, prompt_version, unit.tobytes(), prompt, response, time.time())
+            )
+            self._conn.execute(
+                "DELETE FROM responses WHERE id NOT IN "
+                "(SELECT id FROM responses ORDER BY id DESC LIMIT ?)",
+                (self.max_entries,)
+            )
+
+    def close(self):
+        self._conn.close()
+
+
+def remove_response_cache(path):
+    """Delete a ResponseCache database along with its WAL side files"""
+    path = os.fspath(path)
+    for suffix in ("", "-wal", "-shm"):
+        try:
+            os.remove(path + suffix)
+        except FileNotFoundError:
+            pass
@@ -3,13 +3,16 @@ UI Module - Beautiful CLI interface for borgo-ai
 """
 import sys
 import re
+import functools
 from typing import Optional, Generator
 from rich.console import Console
 from rich.panel import Panel
 from rich.markdown import Markdown
 from rich.syntax import Syntax
 from rich.table import Table
-from rich.progress import Progress, SpinnerColumn, TextColumn
+from rich.progress import (
+    Progress, SpinnerColumn, TextColumn, BarColumn, DownloadColumn, TransferSpeedColumn
+)
 from rich.live import Live
 from rich.text import Text
 from rich.style import Style
@@ -86,8 +89,9 @@ def print_welcome(username: str, theme: str = "cyber"):
     console.print(f"\n[dim]Welcome back, [bold cyan]{username}[/bold cyan]! Type [bold]/help[/bold] for commands.[/dim]\n")
 
 
-def print_help():
-    """Print help information"""
+@functools.lru_cache(maxsize=1)
+def _help_table() -> Table:
+    """The /help table; it never changes, so it's built once and re-printed"""
     help_table = Table(title="📚 Commands", box=ROUNDED, title_style="bold cyan")
     help_table.add_column("Command", style="bold yellow")
     help_table.add_column("Description", style="white")
@@ -122,8 +126,12 @@ def print_help():
     
     for cmd, desc in commands:
         help_table.add_row(cmd, desc)
-    
-    console.print(help_table)
+    return help_table
+
+
+def print_help():
+    """Print help information"""
+    console.print(_help_table())
     console.print("\n[dim]💡 Tip: Just type your message to chat with the AI![/dim]\n")
 
 
@@ -203,6 +211,19 @@ def print_thinking(message: str = "Thinking"):
     )
 
 
+def print_download(message: str = "Downloading"):
+    """Show a download progress bar; the task description carries the current step"""
+    return Progress(
+        SpinnerColumn(),
+        TextColumn(f"[dim]{message}[/dim]"),
+        TextColumn("{task.description}"),
+        BarColumn(),
+        DownloadColumn(),
+        TransferSpeedColumn(),
+        transient=True,
+    )
+
+
 def print_error(message: str):
     """Print error message"""
     # Escape Rich markup characters to prevent crashes
@@ -0,0 +1,94 @@
+"""
+Tests for batching streamed tokens before they reach the console
+"""
+import threading
+import time
+import unittest
+
+from borgo_ai.main import _coalesce
+
+
+def _slow_tokens(schedule):
+    """Yield each (seconds from start, token) pair at its time"""
+    start = time.monotonic()
+    for at, token in schedule:
+        delay = start + at - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+        yield token
+
+
+def _emit_times(batches):
+    """[(seconds from start, batch)] for each batch the consumer receives"""
+    start = time.monotonic()
+    return [(time.monotonic() - start, batch) for batch in batches]
+
+
+class TestCoalesce(unittest.TestCase):
+    """_coalesce batching and its latency bound"""
+
+    # Scheduling slack allowed on top of max_delay
+    SLACK = 0.15
+
+    def test_keeps_every_token_in_order(self):
+        tokens = [f"t{i} " for i in range(100)]
+        batches = list(_coalesce(iter(tokens)))
+        self.assertEqual("".join(batches), "".join(tokens))
+        # Batches grow 1, 3, 9, 27 and stay at 27
+        self.assertEqual([len(b.split()) for b in batches[:4]], [1, 3, 9, 27])
+
+    def test_first_token_is_not_held(self):
+        emitted = _emit_times(_coalesce(_slow_tokens([(0.3, "a"), (1.0, "b")])))
+        at, batch = emitted[0]
+        self.assertEqual(batch, "a")
+        self.assertLess(at, 0.3 + self.SLACK)
+
+    def test_partial_batch_flushed_during_pause(self):
+        # "b" starts a batch of 3 that only fills after a long pause
+        schedule = [(0.0, "a"), (0.1, "b"), (0.9, "c"), (0.9, "d")]
+        emitted = _emit_times(_coalesce(_slow_tokens(schedule), max_delay=0.04))
+
+        self.assertEqual([batch for _, batch in emitted], ["a", "b", "cd"])
+        times = [at for at, _ in emitted]
+        self.assertLess(times[1], 0.1 + 0.04 + self.SLACK)
+        self.assertLess(times[2], 0.9 + 0.04 + self.SLACK)
+
+    def test_token_after_pause_shows_on_time(self):
+        # A token arriving mid-pause is flushed by the timer, not by the next token
+        schedule = [(0.0, "a"), (0.1, "b"), (0.6, "c"), (1.2, "d")]
+        emitted = _emit_times(_coalesce(_slow_tokens(schedule), max_delay=0.04))
+
+        self.assertEqual([batch for _, batch in emitted], ["a", "b", "c", "d"])
+        self.assertLess(emitted[2][0], 0.6 + 0.04 + self.SLACK)
+
+    def test_source_error_is_raised_after_buffered_tokens(self):
+        def failing():
+            yield "a"
+            yield "b"
+            raise ConnectionError("stream broke")
+
+        received = []
+        with self.assertRaises(ConnectionError):
+            for batch in _coalesce(failing()):
+                received.append(batch)
+        self.assertEqual("".join(received), "ab")
+
+    def test_closing_early_stops_the_source(self):
+        closed = threading.Event()
+
+        def endless():
+            try:
+                while True:
+                    yield "x"
+                    time.sleep(0.01)
+            finally:
+                closed.set()
+
+        batches = _coalesce(endless())
+        next(batches)
+        batches.close()
+        self.assertTrue(closed.wait(1.0))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,166 @@
+"""
+Tests for the sandboxed Python worker and the persistent bash shell
+"""
+import os
+import shutil
+import unittest
+
+from borgo_ai.executor import PythonSandbox, BashExecutor
+
+
+class TestPythonSandboxWorker(unittest.TestCase):
+    """PythonSandbox running code in its worker process"""
+
+    def setUp(self):
+        self.sandbox = PythonSandbox(timeout=1.0)
+
+    def tearDown(self):
+        self.sandbox.close()
+
+    def _run(self, code):
+        result = self.sandbox.execute(code)
+        self.assertTrue(self.sandbox.isolated, "worker process could not be started")
+        return result
+
+    def test_runs_in_worker(self):
+        result = self._run("print('hi')\n_result = 6 * 7")
+        self.assertTrue(result.success)
+        self.assertEqual(result.stdout, "hi\n")
+        self.assertEqual(result.return_value, 42)
+        self.assertNotEqual(self.sandbox._worker.pid, os.getpid())
+
+    def test_interrupts_runaway_loop(self):
+        self._run("_result = 1")
+        worker = self.sandbox._worker
+
+        result = self._run("while True:\n    pass")
+        self.assertFalse(result.success)
+        self.assertIn("TimeoutError", result.error)
+        # Interrupted in place: the same worker keeps serving
+        self.assertIs(self.sandbox._worker, worker)
+        self.assertEqual(self._run("_result = 2").return_value, 2)
+
+    def test_kills_and_restarts_hung_worker(self):
+        self._run("_result = 1")
+        pid = self.sandbox._worker.pid
+
+        # A single C-level call never returns to the interpreter, so only the
+        # parent's backstop can stop it
+        result = self._run("_result = sum(range(10 ** 12))")
+        self.assertFalse(result.success)
+        self.assertIn("timed out", result.error)
+        self.assertIsNone(self.sandbox._worker)
+
+        result = self._run("_result = 3")
+        self.assertTrue(result.success)
+        self.assertEqual(result.return_value, 3)
+        self.assertNotEqual(self.sandbox._worker.pid, pid)
+
+    def test_recovers_from_memory_error(self):
+        self._run("_result = 1")
+        worker = self.sandbox._worker
+
+        result = self._run(f"data = bytearray({4 * PythonSandbox.WORKER_MEMORY_LIMIT})")
+        self.assertFalse(result.success)
+        self.assertIn("MemoryError", result.error)
+
+        result = self._run("_result = len([0] * 1000)")
+        self.assertEqual(result.return_value, 1000)
+        self.assertIs(self.sandbox._worker, worker)
+
+    def test_unpicklable_result_falls_back_to_repr(self):
+        result = self._run("_result = (lambda: 1)")
+        self.assertTrue(result.success)
+        self.assertIsInstance(result.return_value, str)
+        self.assertIn("lambda", result.return_value)
+
+        # The worker survives the failed send
+        self.assertEqual(self._run("_result = [1, 2]").return_value, [1, 2])
+
+    def test_runs_do_not_share_names(self):
+        self._run("leaked = 1")
+        result = self._run("_result = leaked")
+        self.assertFalse(result.success)
+        self.assertIn("NameError", result.error)
+
+
+@unittest.skipUnless(os.name == "posix" and shutil.which("bash"), "needs bash")
+class TestBashExecutorShell(unittest.TestCase):
+    """BashExecutor's persistent shell and its sentinel framing"""
+
+    def setUp(self):
+        self.bash = BashExecutor(timeout=2.0)
+
+    def tearDown(self):
+        self.bash.close()
+
+    def _run(self, command, **kwargs):
+        return self.bash.execute(command, approved=True, **kwargs)
+
+    def test_output_and_exit_code(self):
+        result = self._run("echo out; echo err >&2; exit 3")
+        self.assertFalse(result.success)
+        self.assertEqual(result.return_value, 3)
+        self.assertEqual(result.stdout, "out\n")
+        self.assertEqual(result.stderr, "err\n")
+
+    def test_output_without_trailing_newline(self):
+        result = self._run("printf abc; printf def >&2")
+        self.assertEqual((result.stdout, result.stderr), ("abc", "def"))
+
+    def test_large_output(self):
+        # Well past a pipe buffer on both streams at once
+        result = self._run("head -c 300000 /dev/zero | tr '\\0' a; head -c 300000 /dev/zero | tr '\\0' b >&2")
+        self.assertTrue(result.success)
+        self.assertEqual(result.stdout, "a" * 300000)
+        self.assertEqual(result.stderr, "b" * 300000)
+
+    def test_commands_do_not_leak_state(self):
+        self._run("cd /; FOO=bar")
+        pid = self.bash._shell.pid
+        result = self._run("pwd; echo \"[$FOO]\"", cwd=os.getcwd())
+        self.assertEqual(result.stdout, f"{os.getcwd()}\n[]\n")
+        # Same shell process for both commands
+        self.assertEqual(self.bash._shell.pid, pid)
+
+    def test_syntax_errors_fail_only_that_command(self):
+        self._run("true")
+        pid = self.bash._shell.pid
+
+        for command, message in (("echo )", "syntax error"), ('echo "unbalanced', "unexpected EOF")):
+            result = self._run(command)
+            self.assertEqual(result.return_value, 2)
+            self.assertIn(message, result.stderr)
+
+        self.assertEqual(self._run("echo ok").stdout, "ok\n")
+        self.assertEqual(self.bash._shell.pid, pid)
+
+    def test_sentinel_text_in_output(self):
+        # Output that looks like framing can't end the command early
+        result = self._run("printf '\\nabc 0\\n'; echo done")
+        self.assertEqual(result.stdout, "\nabc 0\ndone\n")
+
+    def test_timeout_restarts_shell(self):
+        self._run("true")
+        pid = self.bash._shell.pid
+
+        result = self._run("sleep 10")
+        self.assertFalse(result.success)
+        self.assertEqual(result.error, "Timeout")
+        self.assertIsNone(self.bash._shell)
+
+        self.assertEqual(self._run("echo back").stdout, "back\n")
+        self.assertNotEqual(self.bash._shell.pid, pid)
+
+    def test_shell_death_reports_output(self):
+        result = self._run("echo partial; echo why >&2; kill -9 $$")
+        self.assertFalse(result.success)
+        self.assertEqual(result.stdout, "partial\n")
+        self.assertEqual(result.stderr, "why\n")
+        self.assertIsNone(self.bash._shell)
+
+        self.assertEqual(self._run("echo again").stdout, "again\n")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,155 @@
+"""
+Tests for the semantic answer caches
+"""
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from borgo_ai.semantic_cache import LSHCache, ResponseCache, remove_response_cache
+
+
+def _vectors(n, dim=32, seed=1):
+    return np.random.default_rng(seed).standard_normal((n, dim)).astype(np.float32)
+
+
+class TestLSHCache(unittest.TestCase):
+    """LSHCache lookups, buckets and eviction"""
+
+    def test_hit_and_miss(self):
+        vecs = _vectors(2)
+        cache = LSHCache(dim=32)
+        cache.put(vecs[0], "first")
+
+        self.assertEqual(cache.get(vecs[0]), "first")
+        # Scale doesn't matter, and a small perturbation is still a match
+        self.assertEqual(cache.get(vecs[0] * 3 + 0.001), "first")
+        self.assertIsNone(cache.get(vecs[1]))
+
+    def test_rejects_bad_vectors(self):
+        cache = LSHCache(dim=32)
+        cache.put(np.zeros(32), "zero")
+        cache.put(np.ones(16), "wrong size")
+        self.assertEqual(len(cache), 0)
+        self.assertIsNone(cache.get(np.ones(16)))
+
+    def test_buckets_track_entries(self):
+        vecs = _vectors(3)
+        cache = LSHCache(dim=32, n_tables=4, bits=8)
+        for i, vec in enumerate(vecs):
+            cache.put(vec, i)
+
+        for entry_id, (_, keys, _) in cache._entries.items():
+            self.assertEqual(len(keys), 4)
+            for table, key in zip(cache.tables, keys):
+                self.assertIn(entry_id, table[key])
+
+        # Every bucket member is a live entry, listed once per table
+        for table in cache.tables:
+            ids = [entry_id for bucket in table.values() for entry_id in bucket]
+            self.assertEqual(sorted(ids), sorted(cache._entries))
+
+    def test_evicts_oldest(self):
+        vecs = _vectors(4)
+        cache = LSHCache(dim=32, max_entries=3)
+        for i, vec in enumerate(vecs):
+            cache.put(vec, i)
+
+        self.assertEqual(len(cache), 3)
+        self.assertIsNone(cache.get(vecs[0]))
+        for i in range(1, 4):
+            self.assertEqual(cache.get(vecs[i]), i)
+
+        # The evicted entry leaves no ids or empty buckets behind
+        for table in cache.tables:
+            for bucket in table.values():
+                self.assertTrue(bucket)
+                self.assertTrue(all(entry_id in cache._entries for entry_id in bucket))
+
+        # Rows are reused rather than grown
+        rows = {row for row, _, _ in cache._entries.values()}
+        self.assertEqual(rows, {0, 1, 2})
+
+    def test_clear(self):
+        vecs = _vectors(2)
+        cache = LSHCache(dim=32, max_entries=2)
+        cache.put(vecs[0], "a")
+        cache.clear()
+
+        self.assertEqual(len(cache), 0)
+        self.assertIsNone(cache.get(vecs[0]))
+        self.assertTrue(all(not table for table in cache.tables))
+
+        # Full capacity is available again
+        cache.put(vecs[0], "a")
+        cache.put(vecs[1], "b")
+        self.assertEqual((cache.get(vecs[0]), cache.get(vecs[1])), ("a", "b"))
+
+
+class TestResponseCache(unittest.TestCase):
+    """ResponseCache lookups, scoping and pruning"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "responses.sqlite3")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_scoped_lookup(self):
+        vecs = _vectors(2)
+        cache = ResponseCache(self.path)
+        try:
+            cache.put(vecs[0], "q", "answer", "model-a", "v1")
+
+            self.assertEqual(cache.get(vecs[0] + 0.001, "model-a", "v1"), "answer")
+            self.assertIsNone(cache.get(vecs[1], "model-a", "v1"))
+            self.assertIsNone(cache.get(vecs[0], "model-b", "v1"))
+            self.assertIsNone(cache.get(vecs[0], "model-a", "v2"))
+            # A different embedding size never matches
+            self.assertIsNone(cache.get(np.ones(16), "model-a", "v1"))
+        finally:
+            cache.close()
+
+    def test_persists_across_connections(self):
+        vec = _vectors(1)[0]
+        cache = ResponseCache(self.path)
+        cache.put(vec, "q", "answer", "m", "v1")
+        cache.close()
+
+        cache = ResponseCache(self.path)
+        try:
+            self.assertEqual(cache.get(vec, "m", "v1"), "answer")
+        finally:
+            cache.close()
+
+    def test_prunes_oldest_rows(self):
+        vecs = _vectors(5)
+        cache = ResponseCache(self.path, max_entries=3)
+        try:
+            for i, vec in enumerate(vecs):
+                cache.put(vec, f"q{i}", f"a{i}", "m", "v1")
+
+            count, = cache._conn.execute("SELECT count(*) FROM responses").fetchone()
+            self.assertEqual(count, 3)
+            self.assertIsNone(cache.get(vecs[0], "m", "v1"))
+            self.assertIsNone(cache.get(vecs[1], "m", "v1"))
+            for i in range(2, 5):
+                self.assertEqual(cache.get(vecs[i], "m", "v1"), f"a{i}")
+        finally:
+            cache.close()
+
+    def test_remove_response_cache(self):
+        cache = ResponseCache(self.path)
+        cache.put(_vectors(1)[0], "q", "answer", "m", "v1")
+        cache.close()
+
+        remove_response_cache(self.path)
+        self.assertEqual(os.listdir(self.tmp.name), [])
+        # Removing a cache that doesn't exist is fine
+        remove_response_cache(self.path)
+
+
+if __name__ == '__main__':
+    unittest.main()